@@ -0,0 +1,5 @@
+# Distillation agent
+from .distill_agent import DistillAgent
+from .simplify import simplify_for_patients
+
+__all__ = ['DistillAgent', 'simplify_for_patients']
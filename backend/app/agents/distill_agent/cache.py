@@ -0,0 +1,110 @@
+"""
+Response cache for the Distillation Agent
+
+Protocols don't change once uploaded, so re-distilling the same text is
+wasted tokens and latency. Responses are stored in a small SQLite database
+keyed by a SHA-256 hash of the full prompt.
+
+SemanticCache adds an opt-in nearest-neighbour layer on top: protocols are
+stored with an embedding, and a new protocol whose embedding is nearly
+identical to a stored one reuses that response.
+"""
+
+import os
+import json
+import math
+import time
+import sqlite3
+from contextlib import closing
+from typing import List, Optional
+
+
+class LLMCache:
+    """SQLite-backed cache of Gemini responses keyed by prompt hash"""
+
+    def __init__(self, cache_dir: str = "data", ttl_days: int = 7):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, "llm_cache.db")
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "hash TEXT PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call keeps the cache safe to use from worker threads
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None if missing or expired"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE hash = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        response, created_at = row
+        if time.time() - created_at > self.ttl_seconds:
+            return None
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """Store (or replace) the response for key"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (hash, response, created_at) VALUES (?, ?, ?)",
+                (key, response, int(time.time())),
+            )
+
+
+class SemanticCache:
+    """SQLite-backed store of (embedding, response) pairs for near-duplicate lookups"""
+
+    def __init__(self, cache_dir: str = "data", ttl_days: int = 7):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, "llm_cache.db")
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_cache ("
+                "hash TEXT PRIMARY KEY, embedding TEXT NOT NULL, response TEXT NOT NULL, "
+                "created_at INTEGER NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+    def get_similar(self, embedding: List[float], threshold: float) -> Optional[str]:
+        """Return the response of the closest unexpired entry if its similarity >= threshold"""
+        cutoff = int(time.time() - self.ttl_seconds)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT embedding, response FROM semantic_cache WHERE created_at >= ?", (cutoff,)
+            ).fetchall()
+
+        best_score, best_response = 0.0, None
+        for stored_embedding, response in rows:
+            score = self._cosine(embedding, json.loads(stored_embedding))
+            if score > best_score:
+                best_score, best_response = score, response
+
+        return best_response if best_score >= threshold else None
+
+    def set(self, key: str, embedding: List[float], response: str) -> None:
+        """Store (or replace) the embedding and response for key"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO semantic_cache (hash, embedding, response, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(embedding), response, int(time.time())),
+            )
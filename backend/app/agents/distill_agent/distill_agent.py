@@ -16,58 +16,371 @@ This agent should:
 """
 
 import os
-from typing import Dict, Any
+import re
+import json
+import logging
+import asyncio
+import threading
+import time
+import hashlib
+import datetime
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional
 from dotenv import load_dotenv
 import google.generativeai as genai
+from google.generativeai import caching
+from google.api_core import exceptions as google_exceptions
+
+from .cache import LLMCache, SemanticCache
+
 #import PyPDF2  # Ensure this is installed
 #import fitz  # PyMuPDF
 
+logger = logging.getLogger(__name__)
+
+# Environment and client setup happen once per process, not per agent instance
+load_dotenv()
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+if GEMINI_API_KEY:
+    genai.configure(api_key=GEMINI_API_KEY)
+
+# Resolve prompt files next to this module so the agent works from any working directory
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROMPT_PATH = os.path.join(AGENT_DIR, "prompt.txt")
+EXAMPLE_TABLE_PATH = os.path.join(AGENT_DIR, "example_table.txt")
+
+MODEL_NAME = "gemini-2.5-flash"
+# Bump whenever prompt.txt / example_table.txt change meaning so cached responses are invalidated
+PROMPT_VERSION = "v1"
+RESPONSE_CACHE_DIR = os.getenv("DISTILL_CACHE_DIR", "data")
+
+# Opt-in near-duplicate cache. Off by default: a hit returns another protocol's
+# summary, so the threshold is kept very close to 1.0
+SEMANTIC_CACHE_ENABLED = os.getenv("DISTILL_SEMANTIC_CACHE", "0") == "1"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("DISTILL_SEMANTIC_THRESHOLD", "0.99"))
+EMBEDDING_MODEL = "models/text-embedding-004"
+# The embedding model accepts ~2k tokens; protocols front-load their identifying details
+EMBEDDING_MAX_CHARS = 8000
+# How long Gemini keeps the cached system prompt + example table alive
+CONTEXT_CACHE_TTL = datetime.timedelta(hours=1)
+
+# Shared server-side context cache: (CachedContent, GenerativeModel, expires_at)
+_context_cache = None
+# Set once cache creation fails permanently (e.g. prefix below the minimum cacheable size)
+_context_cache_disabled = False
+# After a transient failure (timeout, 429, 5xx) creation is retried no sooner than this
+_context_cache_retry_at = 0.0
+CONTEXT_CACHE_RETRY_SECONDS = 300
+# Requests run on threadpool workers; only one of them creates or refreshes the cache
+_context_cache_lock = threading.Lock()
+# Errors that will recur on every attempt, so caching is turned off for the process
+PERMANENT_CACHE_ERRORS = (
+    google_exceptions.InvalidArgument,
+    google_exceptions.NotFound,
+    google_exceptions.PermissionDenied,
+)
+
+# Protocols per Gemini request in run_batch; bounded by the model's input token ceiling
+BATCH_SIZE = int(os.getenv("DISTILL_BATCH_SIZE", "8"))
+BATCH_MARKER = "===TRIAL_{}==="
+BATCH_MARKER_RE = re.compile(r"^===TRIAL_(\d+)===\s*$", re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def _load_prompt(path: str) -> str:
+    """Read a static prompt file once and share it across agent instances"""
+    with open(path, "r") as prompt_file:
+        return prompt_file.read()
+
+
+def _get_cached_model(system_prompt: str, example_table: str,
+                      stale_model: Optional[genai.GenerativeModel] = None) -> Optional[genai.GenerativeModel]:
+    """
+    Return a model bound to a Gemini context cache holding the static
+    system prompt and example table, creating (or recreating) it as needed.
+
+    Pass the model whose cache the server rejected as stale_model to force a
+    refresh; the replaced CachedContent is deleted so it stops billing storage.
+    Returns None when context caching is unavailable, e.g. the prefix is
+    below the model's minimum cacheable size, or while backing off after a
+    transient failure.
+    """
+    global _context_cache, _context_cache_disabled, _context_cache_retry_at
+
+    with _context_cache_lock:
+        if _context_cache_disabled or time.monotonic() < _context_cache_retry_at:
+            return None
+        current = _context_cache
+        if current is not None and current[1] is not stale_model and time.monotonic() < current[2]:
+            return current[1]
+
+        try:
+            cache = caching.CachedContent.create(
+                model=f"models/{MODEL_NAME}",
+                system_instruction=system_prompt,
+                contents=[f"Here's an example of what your output should look like:\n\n{example_table}"],
+                ttl=CONTEXT_CACHE_TTL,
+            )
+            model = genai.GenerativeModel.from_cached_content(cached_content=cache)
+        except PERMANENT_CACHE_ERRORS as e:
+            logger.warning("Context caching unavailable, sending the full prompt instead: %s", e)
+            _context_cache = None
+            _context_cache_disabled = True
+            return None
+        except Exception as e:
+            logger.warning("Context cache creation failed, retrying in %ds: %s", CONTEXT_CACHE_RETRY_SECONDS, e)
+            _context_cache_retry_at = time.monotonic() + CONTEXT_CACHE_RETRY_SECONDS
+            return None
+
+        # Refresh a minute early so requests never race the server-side expiry
+        expires_at = time.monotonic() + CONTEXT_CACHE_TTL.total_seconds() - 60
+        _context_cache = (cache, model, expires_at)
+
+    if current is not None:
+        try:
+            current[0].delete()
+        except Exception as e:
+            # Usually already expired or evicted server-side
+            logger.debug("Could not delete replaced context cache: %s", e)
+    return model
+
+
 class DistillAgent:
     def __init__(self):
-        load_dotenv()
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        if not GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY not found in .env file")
-        
-        genai.configure(api_key=api_key)
+
         # You can use gemini-1.5-flash (fast, cheap) or gemini-1.5-pro (smarter)
-        self.model = genai.GenerativeModel("gemini-2.5-flash")
+        self.model = genai.GenerativeModel(MODEL_NAME)
+
+        # Reads the system prompt and example output table once; both are static
+        self.system_prompt = _load_prompt(PROMPT_PATH)
+        self.example_table = _load_prompt(EXAMPLE_TABLE_PATH)
+
+        # Everything except the protocol text is invariant, so build it up front
+        self.prompt_prefix = (
+            f"{self.system_prompt}\n\n"
+            f"Here's an example of what your output should look like:\n\n"
+            f"{self.example_table}\n\n"
+            f"User Query:\nClinical Trial Protocol Text:\n"
+        )
+
+        # Exact-match cache of previous responses, keyed by prompt hash
+        self.response_cache = LLMCache(RESPONSE_CACHE_DIR)
+        self.semantic_cache = SemanticCache(RESPONSE_CACHE_DIR) if SEMANTIC_CACHE_ENABLED else None
 
-        #Reads the system prompt from prompt.txt
-        print(os.getcwd())
-        with open("app/agents/distill_agent/prompt.txt", "r") as prompt_file:
-            prompt_content = prompt_file.read()
-        self.system_prompt = prompt_content
+    def _cache_key(self, protocol_text: str) -> str:
+        """Hash everything that determines the response"""
+        prompt = f"{PROMPT_VERSION}\n{MODEL_NAME}\n{self.prompt_prefix}{protocol_text}"
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def _embed(self, protocol_text: str) -> Optional[List[float]]:
+        """Embed the start of the protocol for semantic cache lookups"""
+        try:
+            result = genai.embed_content(
+                model=EMBEDDING_MODEL,
+                content=protocol_text[:EMBEDDING_MAX_CHARS],
+                task_type="semantic_similarity",
+            )
+            return result["embedding"]
+        except Exception as e:
+            logger.warning("Embedding failed, skipping semantic cache: %s", e)
+            return None
+
+    def _generate(self, protocol_text: str, stream: bool = False):
+        """Call Gemini, reusing the cached prefix when context caching is available"""
+        cached_model = _get_cached_model(self.system_prompt, self.example_table)
+        if cached_model is None:
+            return self.model.generate_content(self.prompt_prefix + protocol_text, stream=stream)
+
+        query = "User Query:\nClinical Trial Protocol Text:\n" + protocol_text
+        try:
+            return cached_model.generate_content(query, stream=stream)
+        except (google_exceptions.NotFound, google_exceptions.PermissionDenied):
+            # Cache expired or was evicted server-side - recreate it and retry once
+            cached_model = _get_cached_model(self.system_prompt, self.example_table, stale_model=cached_model)
+            if cached_model is None:
+                return self.model.generate_content(self.prompt_prefix + protocol_text, stream=stream)
+            return cached_model.generate_content(query, stream=stream)
+
+    @staticmethod
+    def _log_call(cache_key: str, start: float, cache: str, response=None, error: Optional[str] = None,
+                  first_chunk_ms: Optional[float] = None):
+        """Emit one structured distill.call event (latency, token usage, cache outcome)"""
+        usage = getattr(response, "usage_metadata", None)
+        event = {
+            "prompt_hash": cache_key[:16],
+            "cache": cache,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "prompt_tokens": getattr(usage, "prompt_token_count", None),
+            "cached_content_tokens": getattr(usage, "cached_content_token_count", None),
+            "completion_tokens": getattr(usage, "candidates_token_count", None),
+            "error": error,
+        }
+        if first_chunk_ms is not None:
+            event["first_chunk_ms"] = first_chunk_ms
+        logger.info("distill.call %s", json.dumps(event))
 
     def run(self, input_data: Dict[str, Any]):
 
         protocol_text = input_data.get("protocol_text", "")
-        context = f"Clinical Trial Protocol Text:\n" + protocol_text
+        start = time.perf_counter()
 
-        # Adds the example output table to the context
-        table_path = "app/agents/distill_agent/example_table.txt"
-        context += f"\n\nHere's an example of what your output should look like:\n"
-        with open(table_path, 'r') as table_file:
-            table_content = table_file.read()
-            context += f"\n\n{table_content}"
+        # Same protocol + same prompt -> reuse the earlier summary
+        cache_key = self._cache_key(protocol_text)
+        cached_text = self.response_cache.get(cache_key)
+        if cached_text is not None:
+            self._log_call(cache_key, start, "exact")
+            return cached_text
 
-        try:
-            # Combine system + user context
-            prompt = f"{self.system_prompt}\n\nUser Query:\n{context}"
+        embedding = None
+        if self.semantic_cache is not None:
+            embedding = self._embed(protocol_text)
+            if embedding is not None:
+                similar_text = self.semantic_cache.get_similar(embedding, SEMANTIC_CACHE_THRESHOLD)
+                if similar_text is not None:
+                    self._log_call(cache_key, start, "semantic")
+                    return similar_text
 
+        try:
             # Generate text from Gemini
-            response = self.model.generate_content(prompt)
+            response = self._generate(protocol_text)
             
             # Extract the text content from the Gemini response
             # The response object has a .text property that contains the actual generated text
             extracted_text = response.text
 
         except Exception as e:
-            print("Error occurred while generating response:", e)
+            logger.error("Error occurred while generating response: %s", e)
+            self._log_call(cache_key, start, "miss", error=str(e))
             # Return a fallback error message as plain text
             return f"Error generating summary: {str(e)}"
 
+        self._log_call(cache_key, start, "miss", response=response)
+        self.response_cache.set(cache_key, extracted_text)
+        if embedding is not None:
+            self.semantic_cache.set(cache_key, embedding, extracted_text)
         return extracted_text
 
+    def run_stream(self, input_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Yield the summary text chunk by chunk as Gemini streams it back.
+
+        Emits the same distill.call event as run(), plus the time to the
+        first chunk for streamed misses.
+        """
+        protocol_text = input_data.get("protocol_text", "")
+        start = time.perf_counter()
+
+        cache_key = self._cache_key(protocol_text)
+        cached_text = self.response_cache.get(cache_key)
+        if cached_text is not None:
+            self._log_call(cache_key, start, "exact")
+            yield cached_text
+            return
+
+        first_chunk_ms = None
+        last_chunk = None
+        chunks = []
+        try:
+            for chunk in self._generate(protocol_text, stream=True):
+                text = chunk.text
+                if first_chunk_ms is None:
+                    first_chunk_ms = round((time.perf_counter() - start) * 1000, 1)
+                last_chunk = chunk
+                chunks.append(text)
+                yield text
+        except Exception as e:
+            logger.error("Error occurred while streaming response: %s", e)
+            self._log_call(cache_key, start, "miss", error=str(e), first_chunk_ms=first_chunk_ms)
+            yield f"Error generating summary: {str(e)}"
+            return
+
+        # Usage metadata arrives on the final chunk of a streamed response
+        self._log_call(cache_key, start, "miss", response=last_chunk, first_chunk_ms=first_chunk_ms)
+        self.response_cache.set(cache_key, "".join(chunks))
+
+    def run_to_string(self, input_data: Dict[str, Any]) -> str:
+        """Consume run_stream and return the full summary text"""
+        return "".join(self.run_stream(input_data))
+
+    async def run_async(self, input_data: Dict[str, Any]):
+        """Run the agent in a worker thread so callers don't block the event loop"""
+        return await asyncio.to_thread(self.run, input_data)
+
+    def run_batch(self, inputs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Summarize several protocols with one Gemini request per BATCH_SIZE inputs.
+
+        Protocols already in the response cache are answered from it; only the
+        misses are sent, delimited by ===TRIAL_i=== markers, and the model is
+        asked to echo the markers back. Each split summary is cached as if
+        run() had produced it. If a response can't be split into the expected
+        number of summaries, that batch falls back to run().
+        """
+        results: List[Optional[str]] = [None] * len(inputs)
+        keys = [self._cache_key(item.get("protocol_text", "")) for item in inputs]
+
+        misses = []
+        for n, cache_key in enumerate(keys):
+            start = time.perf_counter()
+            cached_text = self.response_cache.get(cache_key)
+            if cached_text is not None:
+                self._log_call(cache_key, start, "exact")
+                results[n] = cached_text
+            else:
+                misses.append(n)
+
+        for offset in range(0, len(misses), BATCH_SIZE):
+            batch = misses[offset:offset + BATCH_SIZE]
+            if len(batch) == 1:
+                results[batch[0]] = self.run(inputs[batch[0]])
+                continue
+
+            protocols = "\n\n".join(
+                f"{BATCH_MARKER.format(i)}\n{inputs[n].get('protocol_text', '')}"
+                for i, n in enumerate(batch)
+            )
+            batch_text = (
+                f"This request contains {len(batch)} separate clinical trial protocols, "
+                f"each starting with a line like {BATCH_MARKER.format(0)}. Write a separate "
+                f"summary for each one, and start each summary with its marker line on its own.\n\n"
+                f"{protocols}"
+            )
+
+            # One distill.call event per Gemini request, keyed on the batched prompt
+            batch_key = self._cache_key(batch_text)
+            start = time.perf_counter()
+            try:
+                response = self._generate(batch_text)
+                summaries = self._split_batch_response(response.text, len(batch))
+            except Exception as e:
+                logger.warning("Batch generation failed, falling back to single requests: %s", e)
+                self._log_call(batch_key, start, "miss", error=str(e))
+                summaries = None
+            else:
+                self._log_call(batch_key, start, "miss", response=response,
+                               error=None if summaries is not None else "unsplittable batch response")
+
+            if summaries is None:
+                for n in batch:
+                    results[n] = self.run(inputs[n])
+            else:
+                for n, summary in zip(batch, summaries):
+                    self.response_cache.set(keys[n], summary)
+                    results[n] = summary
+
+        return results
 
+    @staticmethod
+    def _split_batch_response(text: str, expected: int) -> Optional[List[str]]:
+        """Split a batched response on its ===TRIAL_i=== markers"""
+        matches = list(BATCH_MARKER_RE.finditer(text))
+        summaries = {}
+        for n, match in enumerate(matches):
+            end = matches[n + 1].start() if n + 1 < len(matches) else len(text)
+            summaries[int(match.group(1))] = text[match.end():end].strip()
 
+        if sorted(summaries) != list(range(expected)):
+            return None
+        return [summaries[i] for i in range(expected)]
@@ -0,0 +1,34 @@
+"""
+Patient-friendly rendering of structured trial data for the Distillation Agent
+"""
+
+import os
+from string import Template
+from typing import Dict, Any
+
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patient_template.md")
+
+# Parsed once at import; each call is a single substitute() over the placeholders
+with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+    _PATIENT_TEMPLATE = Template(f.read())
+
+
+def simplify_for_patients(extracted_data: Dict[str, Any]) -> str:
+    """
+    Render extracted trial data as a patient-facing summary.
+
+    Fills patient_template.md with the study title, duration, mechanism,
+    inclusion criteria and side effects (as bullet lists), the number of
+    visits and the primary endpoint. Missing fields fall back to generic
+    wording rather than failing.
+    """
+    return _PATIENT_TEMPLATE.substitute(
+        study_title=extracted_data.get('study_title', 'Clinical Trial'),
+        duration=extracted_data.get('duration', 'several months'),
+        biological_mechanism=extracted_data.get('biological_mechanism', 'We are testing a new treatment approach.'),
+        inclusion_criteria="\n".join(['- ' + criterion for criterion in extracted_data.get('inclusion_criteria', [])]),
+        visit_count=len(extracted_data.get('visit_schedule', [])),
+        side_effects="\n".join(['- ' + effect for effect in extracted_data.get('side_effects', [])]),
+        primary_endpoint=extracted_data.get('endpoints', {}).get('primary', 'health outcomes'),
+    )
@@ -8,8 +8,16 @@ This agent should:
 4. Output images (PNG, SVG, or PDF)
 """
 
-from typing import Dict, Any
-import json
+from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Static icon catalog (pill, clock, calendar, warning, ...) shared by every infographic
+ICONS_DIR = os.path.join(os.path.dirname(__file__), "assets", "icons")
 
 
 def run_agent(input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -32,6 +40,20 @@ def run_agent(input_data: Dict[str, Any]) -> Dict[str, Any]:
     
     Implementation approaches:
     
+    Preferred: render with skia-python (or cairocffi). Text, rectangles and
+    icons are rasterized natively and the same surface can be exported as
+    PNG, SVG or PDF, without the pyplot startup cost of Matplotlib:
+       ```python
+       import skia
+       
+       surface = skia.Surface(1200, 1600)
+       canvas = surface.getCanvas()
+       canvas.clear(skia.ColorWHITE)
+       canvas.drawString(title, 60, 120, skia.Font(None, 48), skia.Paint(Color=skia.ColorBLACK))
+       # Add timeline, boxes, icons
+       surface.makeImageSnapshot().save(output_path, skia.kPNG)
+       ```
+    
     1. Use Matplotlib/Seaborn for Python-based graphics:
        ```python
        import matplotlib.pyplot as plt
@@ -106,6 +128,16 @@ def run_agent(input_data: Dict[str, Any]) -> Dict[str, Any]:
     return mock_result
 
 
+async def run_agent_async(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async wrapper around run_agent.
+
+    Runs the (blocking) generation in a worker thread so it can be awaited
+    from route handlers or gathered alongside the video agent.
+    """
+    return await asyncio.to_thread(run_agent, input_data)
+
+
 def create_timeline_visual(visit_schedule: list) -> Any:
     """
     Helper function to create a timeline visualization.
@@ -124,11 +156,47 @@ def create_side_effects_chart(side_effects: list) -> Any:
     pass
 
 
+@lru_cache(maxsize=128)
+def _load_icon(path: str, size: Optional[Tuple[int, int]] = None) -> Any:
+    """
+    Decode an icon file as an RGBA image.
+
+    The icon set is the same for every trial, so decoded (and resized)
+    bitmaps are cached and only the first infographic pays the PNG decode.
+    Every caller gets the same Image object, so treat it as read-only: paste
+    it, or .copy() it before drawing on it. Callers check the file exists
+    first, so a missing icon is never cached and one added later is picked up.
+    """
+    from PIL import Image
+
+    with Image.open(path) as icon:
+        icon = icon.convert("RGBA")
+    if size is not None:
+        icon = icon.resize(size)
+    return icon
+
+
 def add_icons_and_graphics(image: Any, data: Dict) -> Any:
     """
     Helper function to add icons and graphic elements.
     
-    TODO: Implement icon/graphic overlay
-    - Use icon libraries or generate with AI
+    Args:
+        image: PIL image to draw on
+        data: Dictionary with an "icons" list of {"name", "x", "y", "size"(optional)}
     """
-    pass
+    icons = data.get("icons", [])
+    if icons and not os.path.isdir(ICONS_DIR):
+        logger.warning("Icon catalog %s not found; skipping %d icons", ICONS_DIR, len(icons))
+        return image
+
+    for spec in icons:
+        path = os.path.join(ICONS_DIR, f"{spec['name']}.png")
+        if not os.path.exists(path):
+            logger.warning("Icon %r not found in %s, skipping it", spec["name"], ICONS_DIR)
+            continue
+        size = tuple(spec["size"]) if spec.get("size") else None
+        icon = _load_icon(path, size)
+        # Use the icon's own alpha channel as the paste mask
+        image.paste(icon, (spec.get("x", 0), spec.get("y", 0)), icon)
+
+    return image
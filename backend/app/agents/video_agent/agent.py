@@ -21,30 +21,33 @@ import io
 import json
 import time
 import shutil
+import hashlib
 import logging
+import importlib.util
 import tempfile
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
 import requests
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 import google.generativeai as genai
-from PIL import Image
+from PIL import Image, ImageDraw, ImageFont
+
+# Optional libraries are only located here and imported on first use: rembg pulls in
+# onnxruntime and pyttsx3 a native speech driver, both slow to load and often unused
+# (e.g. ElevenLabs configured, or stage 4 never reached)
 
 # Optional background removal library
-try:
-    from rembg import remove
-    REMBG_AVAILABLE = True
-except Exception:
-    REMBG_AVAILABLE = False
+REMBG_AVAILABLE = importlib.util.find_spec("rembg") is not None
+if not REMBG_AVAILABLE:
     logging.warning("rembg not available - background removal will be skipped. Install with: pip install rembg")
 
 # Optional local TTS fallback
-try:
-    import pyttsx3
-    TTS_LOCAL_AVAILABLE = True
-except Exception:
-    TTS_LOCAL_AVAILABLE = False
+TTS_LOCAL_AVAILABLE = importlib.util.find_spec("pyttsx3") is not None
 
 # Basic logging
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
@@ -55,6 +58,9 @@ load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
+# Built once rather than per narration; kept off HTTP_SESSION so the key never goes to Pollinations
+ELEVENLABS_HEADERS = {"xi-api-key": ELEVENLABS_API_KEY or "", "Content-Type": "application/json"}
+ELEVENLABS_VOICE_SETTINGS = {"stability": 0.6, "similarity_boost": 0.6}
 
 # Model choice and params
 GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash")
@@ -79,8 +85,82 @@ os.makedirs(OUT_DIR, exist_ok=True)
 os.makedirs(IMAGES_DIR, exist_ok=True)
 os.makedirs(PPTX_SLIDES_DIR, exist_ok=True)
 
+# Content-addressed cache shared across runs (e.g. regenerating a trial's video)
+CACHE_DIR = os.getenv("VIDEO_CACHE_DIR", os.path.join("uploads", "video_outputs", "cache"))
+SCRIPT_CACHE_DIR = os.path.join(CACHE_DIR, "scripts")
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "images")
+TTS_CACHE_DIR = os.path.join(CACHE_DIR, "tts")
+NOBG_CACHE_DIR = os.path.join(CACHE_DIR, "no_bg")
+# Narration clips are the bulk of the cache; least recently used clips go past this size
+TTS_CACHE_MAX_BYTES = int(os.getenv("VIDEO_TTS_CACHE_MB", "200")) * 1024 * 1024
+
+# Precompiled patterns (JSON extraction, asset-name sanitising, fuzzy name matching).
+# DOTALL ".*" replaces the old "(?:.|\n)*", which backtracks through a two-way alternation per character
+JSON_BLOCK_RE = re.compile(r"(\{.*\}|\[.*\])", re.DOTALL)
+UNSAFE_NAME_CHARS_RE = re.compile(r"[^A-Za-z0-9_-]")
+NAME_WORD_SPLIT_RE = re.compile(r"[_\s-]+")
+# Deletes "_", " " and "-" in one str.translate pass instead of three chained replace() calls
+NAME_SEPARATORS = str.maketrans("", "", "_ -")
+
 # Pollinations quick image endpoint
 POLLINATIONS_IMG_ENDPOINT = "https://image.pollinations.ai/prompt/"
+# Ask Pollinations for images at the size slides actually use. Stage 6 scales every image
+# into a 16:9 box of at most ~0.6 of the 1920x1080 frame, so the default 1024x1024 square
+# is both oversized (bytes to download, rembg work) and distorted when stretched
+POLLINATIONS_IMG_WIDTH = int(os.getenv("POLLINATIONS_IMG_WIDTH", "1280"))
+POLLINATIONS_IMG_HEIGHT = int(os.getenv("POLLINATIONS_IMG_HEIGHT", "720"))
+POLLINATIONS_PARAMS = {"width": POLLINATIONS_IMG_WIDTH, "height": POLLINATIONS_IMG_HEIGHT}
+# Concurrent Pollinations requests in stage 3
+POLL_CONCURRENCY = int(os.getenv("POLL_CONCURRENCY", "4"))
+
+# Shared HTTP session: Pollinations and ElevenLabs calls reuse pooled keep-alive
+# connections instead of paying a new TCP + TLS handshake per request.
+# Transport-level retries cover dropped connections and 429/5xx on GETs; the stage 3
+# attempt loop still handles bad image payloads and prompt simplification on top of this.
+# Reads aren't retried here (a 60s timeout retried would just stall), nor are POSTs.
+HTTP_RETRY = Retry(
+    total=2,
+    connect=2,
+    read=0,
+    backoff_factor=0.3,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    raise_on_status=False,
+)
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=HTTP_RETRY))
+
+
+# Narrations synthesized in parallel in stage 7; ElevenLabs calls are plain HTTPS requests
+TTS_CONCURRENCY = int(os.getenv("VIDEO_TTS_CONCURRENCY", "4"))
+# Per-slide ffmpeg encodes run concurrently in stage 7; each is its own process
+ENCODE_CONCURRENCY = int(os.getenv("VIDEO_ENCODE_CONCURRENCY", str(max(1, (os.cpu_count() or 2) // 2))))
+# Output frame rate of the slide videos (the image2 demuxer's own default)
+VIDEO_FPS = 25
+# x264 threads per encode, splitting the cores between the concurrent encodes
+ENCODE_THREADS = int(os.getenv("VIDEO_ENCODE_THREADS", str(max(1, (os.cpu_count() or 2) // max(1, ENCODE_CONCURRENCY)))))
+# Hardware H.264 encoders tried (in order) before falling back to libx264: NVIDIA, then
+# macOS VideoToolbox. Set VIDEO_HW_ENCODE=0 to always use libx264. GPUs cap concurrent
+# encode sessions, and hardware encoders need an explicit bitrate (their defaults are low).
+HW_H264_ENCODERS = ("h264_nvenc", "h264_videotoolbox")
+VIDEO_HW_ENCODE = os.getenv("VIDEO_HW_ENCODE", "1") != "0"
+HW_ENCODE_SESSIONS = int(os.getenv("VIDEO_HW_ENCODE_SESSIONS", "3"))
+HW_ENCODE_BITRATE = os.getenv("VIDEO_HW_ENCODE_BITRATE", "4M")
+# Speaking rate (words per minute) of the local pyttsx3 fallback
+LOCAL_TTS_RATE = 150
+# pyttsx3 drives a single native speech engine and is not thread-safe
+_LOCAL_TTS_LOCK = threading.Lock()
+_local_tts_engine = None
+
+
+def _get_local_tts_engine():
+    """Initialise the pyttsx3 engine on first use and reuse it; call with _LOCAL_TTS_LOCK held"""
+    global _local_tts_engine
+    if _local_tts_engine is None:
+        import pyttsx3
+        _local_tts_engine = pyttsx3.init()
+        _local_tts_engine.setProperty('rate', LOCAL_TTS_RATE)
+    return _local_tts_engine
 
 
 ### -------------------- Gemini Setup --------------------
@@ -89,6 +169,8 @@ if not GEMINI_API_KEY:
 
 genai.configure(api_key=GEMINI_API_KEY)
 GENIE_MODEL = genai.GenerativeModel(GEMINI_MODEL_NAME)
+# Concurrent per-segment Gemini calls (stage 2)
+GEMINI_CONCURRENCY = int(os.getenv("VIDEO_GEMINI_CONCURRENCY", "4"))
 
 
 ### -------------------- Utility helpers --------------------
@@ -115,7 +197,7 @@ def robust_parse_json(text: str) -> Any:
         pass
 
     # Regex to find {...} or [ ... ] blocks
-    m = re.search(r"(\{(?:.|\n)*\}|\[(?:.|\n)*\])", text)
+    m = JSON_BLOCK_RE.search(text)
     if m:
         try:
             return json.loads(m.group(1))
@@ -269,6 +351,15 @@ def stage1_generate_script(trial_summary: str, out_path: str = os.path.join(OUT_
     prompt_template = load_text_file(PROMPT_TRANSCRIPT)
     prompt = prompt_template + "\n\nClinical Trial Summary:\n" + trial_summary + "\n\nRespond with a JSON object containing video_title, video_intro, and segments as described."
 
+    # Regenerating a video for an unchanged summary reuses the validated script
+    cache_path = os.path.join(SCRIPT_CACHE_DIR, hashlib.sha256(prompt.encode("utf-8")).hexdigest() + ".json")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            parsed = json.load(f)
+        logging.info("Using cached script for identical summary: %s", cache_path)
+        save_json(parsed, out_path)
+        return parsed
+
     raw = call_gemini(prompt, system=None)
     try:
         parsed = robust_parse_json(raw)
@@ -280,9 +371,49 @@ def stage1_generate_script(trial_summary: str, out_path: str = os.path.join(OUT_
         raise ValueError("Invalid step1 JSON structure")
 
     save_json(parsed, out_path)
+    os.makedirs(SCRIPT_CACHE_DIR, exist_ok=True)
+    save_json(parsed, cache_path)
     return parsed
 
 
+def _stage2_segment_assets(idx: int, seg: Dict[str, Any], prompt_template: str, context_prompt: str) -> List[Dict[str, Any]]:
+    """Ask Gemini for one segment's visual assets and validate them"""
+    image_desc = seg.get("image_description", "")
+    # Static template first, then per-run context, then the per-segment part so
+    # consecutive calls share the longest possible prefix (implicit prompt caching)
+    prompt = prompt_template + "\n\n" + context_prompt + "\n\nReturn a JSON list of assets with fields: name, style, purpose, prompt. Keep items short and simple.\n\nImage description:\n" + image_desc
+    raw = call_gemini(prompt)
+    parsed = robust_parse_json(raw)
+
+    # Save intermediate output for debugging before validation
+    debug_path = os.path.join(OUT_DIR, f"step2_segment{idx}_raw.json")
+    save_json({"segment_index": idx, "raw_response": raw, "parsed_response": parsed}, debug_path)
+    
+    # Extract assets from nested structure if needed
+    # Gemini sometimes returns {"segments": [{"visual_assets": [...]}]} instead of a flat list
+    assets = parsed
+    if isinstance(parsed, dict):
+        # Check for nested structure patterns
+        if "segments" in parsed and isinstance(parsed["segments"], list) and len(parsed["segments"]) > 0:
+            if "visual_assets" in parsed["segments"][0]:
+                assets = parsed["segments"][0]["visual_assets"]
+                logging.info("Extracted assets from nested 'segments[0].visual_assets' structure")
+        elif "visual_assets" in parsed:
+            assets = parsed["visual_assets"]
+            logging.info("Extracted assets from 'visual_assets' key")
+        elif "assets" in parsed:
+            assets = parsed["assets"]
+            logging.info("Extracted assets from 'assets' key")
+    
+    if not validate_assets_json(assets):
+        logging.error("Asset generation validation failed for segment %s. Structure: %s", idx, type(assets))
+        raise ValueError("Invalid assets JSON")
+    # attach segment index for provenance
+    for a in assets:
+        a.setdefault("segment_index", idx)
+    return assets
+
+
 def stage2_generate_assets(step1_path: str = os.path.join(OUT_DIR, "step1_script.json"), out_path: str = os.path.join(OUT_DIR, "step2_assets.json")) -> List[Dict[str, Any]]:
     """For each segment image_description, ask Gemini to produce visual assets (name, style, purpose, prompt).
 
@@ -301,39 +432,12 @@ def stage2_generate_assets(step1_path: str = os.path.join(OUT_DIR, "step1_script
 Use this complete video script as context when generating visual assets.
 """
 
-    for idx, seg in enumerate(script["segments"]):
-        image_desc = seg.get("image_description", "")
-        prompt = context_prompt + "\n\n" + prompt_template + "\n\nImage description:\n" + image_desc + "\n\nReturn a JSON list of assets with fields: name, style, purpose, prompt. Keep items short and simple."
-        raw = call_gemini(prompt)
-        parsed = robust_parse_json(raw)
-
-        # Save intermediate output for debugging before validation
-        debug_path = os.path.join(OUT_DIR, f"step2_segment{idx}_raw.json")
-        save_json({"segment_index": idx, "raw_response": raw, "parsed_response": parsed}, debug_path)
-        
-        # Extract assets from nested structure if needed
-        # Gemini sometimes returns {"segments": [{"visual_assets": [...]}]} instead of a flat list
-        assets = parsed
-        if isinstance(parsed, dict):
-            # Check for nested structure patterns
-            if "segments" in parsed and isinstance(parsed["segments"], list) and len(parsed["segments"]) > 0:
-                if "visual_assets" in parsed["segments"][0]:
-                    assets = parsed["segments"][0]["visual_assets"]
-                    logging.info("Extracted assets from nested 'segments[0].visual_assets' structure")
-            elif "visual_assets" in parsed:
-                assets = parsed["visual_assets"]
-                logging.info("Extracted assets from 'visual_assets' key")
-            elif "assets" in parsed:
-                assets = parsed["assets"]
-                logging.info("Extracted assets from 'assets' key")
-        
-        if not validate_assets_json(assets):
-            logging.error("Asset generation validation failed for segment %s. Structure: %s", idx, type(assets))
-            raise ValueError("Invalid assets JSON")
-        # attach segment index for provenance
-        for a in assets:
-            a.setdefault("segment_index", idx)
-        all_assets.extend(assets)
+    # Segments are independent Gemini calls; run them concurrently and keep segment order
+    segments = list(enumerate(script["segments"]))
+    with ThreadPoolExecutor(max_workers=max(1, GEMINI_CONCURRENCY)) as pool:
+        per_segment = pool.map(lambda item: _stage2_segment_assets(item[0], item[1], prompt_template, context_prompt), segments)
+        for assets in per_segment:
+            all_assets.extend(assets)
 
     save_json(all_assets, out_path)
     return all_assets
@@ -341,6 +445,127 @@ Use this complete video script as context when generating visual assets.
 
 
 
+def _copy_from_cache(cache_path: str, out_path: str) -> bool:
+    """Copy a cache entry to out_path; any OSError (e.g. pruned meanwhile) is just a miss"""
+    try:
+        shutil.copyfile(cache_path, out_path)
+        os.utime(cache_path)  # mark as recently used for pruning
+        return True
+    except OSError:
+        return False
+
+
+def _publish_to_cache(src_path: str, cache_path: str) -> None:
+    """Best-effort atomic copy of src_path into the cache; failures only cost a future miss.
+
+    The temp name comes from mkstemp, so concurrent threads and worker processes never
+    share one.
+    """
+    cache_dir = os.path.dirname(cache_path)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+        os.close(fd)
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.warning("Could not write cache entry %s: %s", cache_path, e)
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _download_image(url: str, img_path: str) -> None:
+    """Stream a Pollinations image straight to img_path without buffering the whole body.
+
+    Raises if the request fails or the body is too small to be a real image (error HTML).
+    The file is written under a temporary name and only moved into place once validated.
+    """
+    # Per-thread temp name: stage 3 downloads run concurrently
+    tmp_path = f"{img_path}.{threading.get_ident()}.part"
+    size = 0
+    try:
+        with HTTP_SESSION.get(url, params=POLLINATIONS_PARAMS, timeout=60, stream=True) as r:
+            r.raise_for_status()
+            # Error pages come back as text/html with a 200; reject them before reading the body
+            content_type = r.headers.get("Content-Type", "")
+            if content_type and not content_type.startswith("image/"):
+                raise ValueError(f"Unexpected content type {content_type!r}")
+            with open(tmp_path, "wb") as fh:
+                for chunk in r.iter_content(chunk_size=64 * 1024):
+                    fh.write(chunk)
+                    size += len(chunk)
+
+        # Verify we got actual image data (not error HTML)
+        if size < 1000:
+            raise ValueError("Response too small to be a valid image")
+        os.replace(tmp_path, img_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _generate_one_image(item: Dict[str, Any], images_dir: str) -> Optional[Dict[str, Any]]:
+    """Fetch one asset's image with the 3 original + 3 simplified attempts; None if all fail"""
+    name = UNSAFE_NAME_CHARS_RE.sub("_", item.get("name", "asset"))
+    original_prompt = item.get("prompt") or item.get("name")
+    
+    img_path = os.path.join(images_dir, f"{name}.png")
+
+    # Identical prompts at the same size skip Pollinations entirely on later runs
+    cache_key = f"{original_prompt}|{POLLINATIONS_IMG_WIDTH}x{POLLINATIONS_IMG_HEIGHT}"
+    cache_path = os.path.join(IMAGE_CACHE_DIR, hashlib.sha256(cache_key.encode("utf-8")).hexdigest()[:16] + ".png")
+    if _copy_from_cache(cache_path, img_path):
+        logging.info("Using cached image for '%s': %s", name, cache_path)
+        return {"name": name, "path": img_path, "prompt": original_prompt}
+
+    # Try with original prompt first (3 attempts)
+    result = None
+    current_prompt = original_prompt
+    
+    for attempt in range(1, 4):  # 3 attempts with original prompt
+        url = POLLINATIONS_IMG_ENDPOINT + requests.utils.quote(current_prompt)
+        logging.info("Requesting image for '%s' (attempt %d/3)", name, attempt)
+        try:
+            _download_image(url, img_path)
+            result = {"name": name, "path": img_path, "prompt": current_prompt}
+            logging.info("✓ Saved image %s", img_path)
+            break
+        except Exception as e:
+            logging.warning("Attempt %d failed for '%s': %s", attempt, name, e)
+            time.sleep(1)  # Brief pause before retry
+    
+    # If original prompt failed 3 times, simplify and try again
+    if result is None:
+        logging.info("Original prompt failed 3 times. Simplifying prompt with Gemini...")
+        simplified_prompt = simplify_image_prompt(original_prompt)
+        current_prompt = simplified_prompt
+        
+        for attempt in range(1, 4):  # 3 attempts with simplified prompt
+            url = POLLINATIONS_IMG_ENDPOINT + requests.utils.quote(current_prompt)
+            logging.info("Requesting image for '%s' with simplified prompt (attempt %d/3)", name, attempt)
+            try:
+                _download_image(url, img_path)
+                result = {"name": name, "path": img_path, "prompt": current_prompt, "simplified": True}
+                logging.info("✓ Saved image %s with simplified prompt", img_path)
+                break
+            except Exception as e:
+                logging.warning("Simplified attempt %d failed for '%s': %s", attempt, name, e)
+                time.sleep(1)
+    
+    if result is None:
+        logging.error("✗ Failed to generate image for '%s' after 6 total attempts (3 original + 3 simplified)", name)
+    else:
+        # Two assets can share a prompt, so the entry is published atomically
+        _publish_to_cache(img_path, cache_path)
+        time.sleep(0.5)  # Rate limiting between successful requests
+
+    return result
+
+
 def stage3_generate_images(step2_path: str = os.path.join(OUT_DIR, "step2_assets.json"), images_dir: str = IMAGES_DIR) -> List[Dict[str, Any]]:
     """Generate images using Pollinations (simple GET endpoint). Save images/<asset_name>.png
     
@@ -355,69 +580,12 @@ def stage3_generate_images(step2_path: str = os.path.join(OUT_DIR, "step2_assets
     with open(step2_path, "r", encoding="utf-8") as f:
         assets = json.load(f)
 
-    results = []
-    for item in assets:
-        name = re.sub(r"[^A-Za-z0-9_-]", "_", item.get("name", "asset"))
-        original_prompt = item.get("prompt") or item.get("name")
-        
-        # Try with original prompt first (3 attempts)
-        success = False
-        img_path = os.path.join(images_dir, f"{name}.png")
-        current_prompt = original_prompt
-        
-        for attempt in range(1, 4):  # 3 attempts with original prompt
-            url = POLLINATIONS_IMG_ENDPOINT + requests.utils.quote(current_prompt)
-            logging.info("Requesting image for '%s' (attempt %d/3)", name, attempt)
-            try:
-                r = requests.get(url, timeout=60)
-                r.raise_for_status()
-                
-                # Verify we got actual image data (not error HTML)
-                if len(r.content) < 1000:
-                    raise ValueError("Response too small to be a valid image")
-                
-                with open(img_path, "wb") as fh:
-                    fh.write(r.content)
-                results.append({"name": name, "path": img_path, "prompt": current_prompt})
-                logging.info("✓ Saved image %s", img_path)
-                success = True
-                break
-            except Exception as e:
-                logging.warning("Attempt %d failed for '%s': %s", attempt, name, e)
-                time.sleep(1)  # Brief pause before retry
-        
-        # If original prompt failed 3 times, simplify and try again
-        if not success:
-            logging.info("Original prompt failed 3 times. Simplifying prompt with Gemini...")
-            simplified_prompt = simplify_image_prompt(original_prompt)
-            current_prompt = simplified_prompt
-            
-            for attempt in range(1, 4):  # 3 attempts with simplified prompt
-                url = POLLINATIONS_IMG_ENDPOINT + requests.utils.quote(current_prompt)
-                logging.info("Requesting image for '%s' with simplified prompt (attempt %d/3)", name, attempt)
-                try:
-                    r = requests.get(url, timeout=60)
-                    r.raise_for_status()
-                    
-                    if len(r.content) < 1000:
-                        raise ValueError("Response too small to be a valid image")
-                    
-                    with open(img_path, "wb") as fh:
-                        fh.write(r.content)
-                    results.append({"name": name, "path": img_path, "prompt": current_prompt, "simplified": True})
-                    logging.info("✓ Saved image %s with simplified prompt", img_path)
-                    success = True
-                    break
-                except Exception as e:
-                    logging.warning("Simplified attempt %d failed for '%s': %s", attempt, name, e)
-                    time.sleep(1)
-        
-        if not success:
-            logging.error("✗ Failed to generate image for '%s' after 6 total attempts (3 original + 3 simplified)", name)
-        else:
-            time.sleep(0.5)  # Rate limiting between successful requests
+    # Each asset is an independent, network-bound request, so fetch them side by side;
+    # map() keeps results in asset order
+    with ThreadPoolExecutor(max_workers=max(1, POLL_CONCURRENCY)) as pool:
+        fetched = list(pool.map(lambda item: _generate_one_image(item, images_dir), assets))
 
-    return results
+    return [result for result in fetched if result is not None]
 
 
 def stage4_remove_backgrounds(images_info: List[Dict[str, Any]], output_dir: str = IMAGES_DIR) -> List[Dict[str, Any]]:
@@ -432,8 +600,16 @@ def stage4_remove_backgrounds(images_info: List[Dict[str, Any]], output_dir: str
     if not REMBG_AVAILABLE:
         logging.warning("Skipping background removal - rembg not installed. Images will keep their backgrounds.")
         return images_info
+    try:
+        from rembg import remove, new_session
+    except Exception as e:
+        logging.warning("Skipping background removal - rembg failed to import: %s", e)
+        return images_info
     
     results = []
+    # remove() without a session loads the ONNX model on every call; load it once,
+    # and only if some image actually misses the cache
+    session = None
     processed_dir = os.path.join(output_dir, "no_bg")
     os.makedirs(processed_dir, exist_ok=True)
     
@@ -449,16 +625,25 @@ def stage4_remove_backgrounds(images_info: List[Dict[str, Any]], output_dir: str
         
         logging.info("Removing background from '%s'...", name)
         try:
-            # Load the image
+            # Cached images from stage 3 come back byte-identical, so key the (slow)
+            # rembg result on the input's content hash
             with open(original_path, 'rb') as input_file:
-                input_data = input_file.read()
-            
-            # Remove background
-            output_data = remove(input_data)
-            
-            # Save as PNG with transparency
-            with open(output_path, 'wb') as output_file:
-                output_file.write(output_data)
+                digest = hashlib.sha256(input_file.read()).hexdigest()[:16]
+            cache_path = os.path.join(NOBG_CACHE_DIR, digest + ".png")
+            if _copy_from_cache(cache_path, output_path):
+                logging.info("Using cached background removal for '%s'", name)
+            else:
+                # Remove background (rembg returns a PIL image when given one)
+                if session is None:
+                    session = new_session()
+                with Image.open(original_path) as input_image:
+                    output_image = remove(input_image, session=session)
+                
+                # Save as PNG with transparency; it's an intermediate that stage 6 decodes
+                # once, so PNG is kept for the alpha channel but with fast zlib settings
+                output_image.save(output_path, compress_level=1)
+                # Best-effort: a failed cache write must not discard the rembg result
+                _publish_to_cache(output_path, cache_path)
             
             # Update the image info with new path
             updated_info = img_info.copy()
@@ -479,6 +664,20 @@ def stage4_remove_backgrounds(images_info: List[Dict[str, Any]], output_dir: str
     return results
 
 
+def _stage5_segment_slide(seg: Dict[str, Any], prompt_prefix: str) -> Dict[str, Any]:
+    """Ask Gemini for one segment's slide layout, filling in defaults for missing fields"""
+    # Static template first, per-run context next, per-segment details last (prompt cache friendly)
+    prompt = prompt_prefix + "\n\nSegment:\n" + json.dumps(seg, ensure_ascii=False)
+    raw = call_gemini(prompt)
+    parsed = robust_parse_json(raw)
+    # Expect parsed to be a dict describing a slide
+    slide = parsed if isinstance(parsed, dict) else {"slide_title": seg.get("section_title"), "caption": seg.get("educational_goal"), "slide_duration": 6, "images": []}
+    slide.setdefault("slide_title", seg.get("section_title"))
+    slide.setdefault("caption", seg.get("educational_goal"))
+    slide.setdefault("slide_duration", max(5, min(12, len(seg.get("narration", "").split()) // 2)))
+    return slide
+
+
 def stage5_generate_slides(step1_path: str = os.path.join(OUT_DIR, "step1_script.json"), 
                            step2_path: str = os.path.join(OUT_DIR, "step2_assets.json"),
                            images_info: List[Dict[str, Any]] = None, 
@@ -516,20 +715,13 @@ STAGE 3/4 - Generated Images (available for use):
 Use all of the above context when designing slide layouts to ensure consistency with the overall video narrative and available visual assets.
 """
 
-    slides = []
-    for idx, seg in enumerate(script["segments"]):
-        prompt = context_prompt + "\n\n" + prompt_template + "\n\nSegment:\n" + json.dumps(seg, ensure_ascii=False)
-        # Provide available images for this segment
-        candidate_images = [n for n,p in image_index.items() if str(idx) in (p.get("path") or "") or True]
-        prompt += "\n\nAvailable images: " + ", ".join(candidate_images)
-        raw = call_gemini(prompt)
-        parsed = robust_parse_json(raw)
-        # Expect parsed to be a dict describing a slide
-        slide = parsed if isinstance(parsed, dict) else {"slide_title": seg.get("section_title"), "caption": seg.get("educational_goal"), "slide_duration": 6, "images": []}
-        slide.setdefault("slide_title", seg.get("section_title"))
-        slide.setdefault("caption", seg.get("educational_goal"))
-        slide.setdefault("slide_duration", max(5, min(12, len(seg.get("narration", "").split()) // 2)))
-        slides.append(slide)
+    # Every generated image is offered to every segment, so this is the same for all calls
+    available_images = "\n\nAvailable images: " + ", ".join(image_index.keys())
+
+    # Segments are independent Gemini calls; run them concurrently and keep segment order
+    prompt_prefix = prompt_template + "\n\n" + context_prompt + available_images
+    with ThreadPoolExecutor(max_workers=max(1, GEMINI_CONCURRENCY)) as pool:
+        slides = list(pool.map(lambda seg: _stage5_segment_slide(seg, prompt_prefix), script["segments"]))
 
     save_json(slides, out_path)
     return slides
@@ -544,13 +736,14 @@ def tts_synthesize(text: str, out_path: str, voice: str = "alloy", cheerful: boo
     if ELEVENLABS_API_KEY:
         # Minimal ElevenLabs example using their text-to-speech API
         url = "https://api.elevenlabs.io/v1/text-to-speech/" + voice
-        headers = {"xi-api-key": ELEVENLABS_API_KEY, "Content-Type": "application/json"}
-        body = {"text": text, "voice_settings": {"stability":0.6, "similarity_boost":0.6}}
+        body = {"text": text, "voice_settings": ELEVENLABS_VOICE_SETTINGS}
         try:
-            resp = requests.post(url, headers=headers, json=body, timeout=30)
-            resp.raise_for_status()
-            with open(out_path, "wb") as f:
-                f.write(resp.content)
+            # Stream the audio to disk as it arrives instead of buffering the whole clip
+            with HTTP_SESSION.post(url, headers=ELEVENLABS_HEADERS, json=body, timeout=30, stream=True) as resp:
+                resp.raise_for_status()
+                with open(out_path, "wb") as f:
+                    for chunk in resp.iter_content(chunk_size=16 * 1024):
+                        f.write(chunk)
             return out_path
         except Exception as e:
             logging.error("ElevenLabs TTS failed: %s", e)
@@ -558,10 +751,10 @@ def tts_synthesize(text: str, out_path: str, voice: str = "alloy", cheerful: boo
 
     if TTS_LOCAL_AVAILABLE:
         try:
-            engine = pyttsx3.init()
-            engine.setProperty('rate', 150)
-            engine.save_to_file(text, out_path)
-            engine.runAndWait()
+            with _LOCAL_TTS_LOCK:
+                engine = _get_local_tts_engine()
+                engine.save_to_file(text, out_path)
+                engine.runAndWait()
             return out_path
         except Exception as e:
             logging.error("Local TTS (pyttsx3) failed: %s", e)
@@ -570,24 +763,94 @@ def tts_synthesize(text: str, out_path: str, voice: str = "alloy", cheerful: boo
     raise RuntimeError("No TTS available: ELEVENLABS_API_KEY not configured and pyttsx3 not installed. Please provide ELEVENLABS_API_KEY in environment variables or install pyttsx3.")
 
 
+SLIDE_BG_COLOR = (0x2d, 0x34, 0x36)
+# Slides rendered concurrently in stage 6
+SLIDE_RENDER_CONCURRENCY = int(os.getenv("VIDEO_SLIDE_CONCURRENCY", str(os.cpu_count() or 2)))
+
+
+@lru_cache(maxsize=1)
+def _slide_fonts():
+    """Load the (title, caption) fonts once; parsing a TrueType file per slide is wasted work"""
+    try:
+        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 64)
+        caption_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 42)
+    except:
+        try:
+            title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 64)
+            caption_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 42)
+        except:
+            title_font = ImageFont.load_default()
+            caption_font = ImageFont.load_default()
+    return title_font, caption_font
+
+
+@lru_cache(maxsize=4)
+def _slide_background(width: int, height: int) -> Image.Image:
+    """Solid slide background; callers must .copy() before drawing on it"""
+    return Image.new("RGB", (width, height), SLIDE_BG_COLOR)
+
+
+@lru_cache(maxsize=16)
+def _caption_band(width: int, height: int) -> Image.Image:
+    """Semi-transparent caption backdrop, cached per size (captions only vary by line count)"""
+    return Image.new("RGBA", (width, height), (0, 0, 0, 180))
+
+
+@lru_cache(maxsize=32)
+def _slide_layer(path: str, width: int, height: int, mtime_ns: int, size: int) -> Image.Image:
+    """Decode and scale an asset once; slides often reuse the same image at the same size.
+
+    mtime_ns and size only feed the cache key: stage 3/4 rewrite the same filenames on
+    later runs, and a rewritten file must not hit a bitmap decoded from the old one.
+    """
+    with Image.open(path) as src:
+        return src.convert('RGBA').resize((width, height))
+
+
+def _wrap_by_width(draw: ImageDraw.ImageDraw, text: str, font, max_width: float) -> List[str]:
+    """Greedily wrap text into lines no wider than max_width pixels.
+
+    Each word is measured once and the line width kept as a running total, rather than
+    re-measuring the whole growing line after every word. A word wider than max_width
+    gets a line of its own.
+    """
+    lines = []
+    current_line = []
+    space_width = draw.textlength(" ", font=font)
+    line_width = 0.0
+    for word in text.split():
+        word_width = draw.textlength(word, font=font)
+        if current_line and line_width + space_width + word_width > max_width:
+            lines.append(" ".join(current_line))
+            current_line = []
+        if current_line:
+            line_width += space_width + word_width
+        else:
+            line_width = word_width
+        current_line.append(word)
+
+    if current_line:
+        lines.append(" ".join(current_line))
+    return lines
+
+
 def stage6_create_ffmpeg_slides(
     slides_json_path: str = os.path.join(OUT_DIR, "step4_slides.json"),
     images_info: List[Dict[str, Any]] = None,
     output_dir: str = PPTX_SLIDES_DIR
 ) -> List[Dict[str, Any]]:
-    """Create slide images using ffmpeg by compositing images and text overlays.
+    """Create slide images by compositing images and text overlays.
     
-    This approach uses ffmpeg's powerful filtering to:
+    Each slide is built in memory with PIL:
     1. Create a dark background
     2. Overlay images at specified positions
     3. Add title and caption text with styling
     4. Export as PNG images
     
+    (The name is kept from when the compositing step shelled out to ffmpeg.)
+    
     Returns: List of exported slide info with paths to PNG files
     """
-    if shutil.which("ffmpeg") is None:
-        raise RuntimeError("ffmpeg not found - required for slide creation")
-    
     with open(slides_json_path, "r", encoding="utf-8") as f:
         slides_data = json.load(f)
     
@@ -603,7 +866,7 @@ def stage6_create_ffmpeg_slides(
                 continue
             
             # Create normalized version: lowercase, no underscores, no spaces, no _nobg
-            normalized = name.lower().replace("_nobg", "").replace("_", "").replace(" ", "").replace("-", "")
+            normalized = name.lower().replace("_nobg", "").translate(NAME_SEPARATORS)
             
             # Store with original name and variations
             image_lookup[name] = path
@@ -619,21 +882,17 @@ def stage6_create_ffmpeg_slides(
         logging.info("Built image lookup with %d entries from %d images", len(image_lookup), len(images_info))
     
     os.makedirs(output_dir, exist_ok=True)
-    exported_slides = []
     
     # Slide dimensions (16:9 aspect ratio)
     slide_width = 1920
     slide_height = 1080
     
-    for idx, slide_data in enumerate(slides_data):
+    def _render_slide(idx: int, slide_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         logging.info("Creating slide %d: %s", idx + 1, slide_data.get("slide_title", "Untitled"))
         
         output_path = os.path.join(output_dir, f"slide_{idx:03d}.png")
         
         try:
-            # Start with a solid color background
-            filter_parts = []
-            inputs = []
             found_images = []  # Track actually found images
             
             # Add images from the slide
@@ -657,14 +916,13 @@ def stage6_create_ffmpeg_slides(
                         break
                 
                 # If not found, try normalized matching (remove spaces, underscores, case)
+                normalized_request = img_name.lower().translate(NAME_SEPARATORS)
                 if not local_path:
-                    normalized_request = img_name.lower().replace("_", "").replace(" ", "").replace("-", "")
                     if normalized_request in image_files_by_normalized:
                         local_path = image_files_by_normalized[normalized_request]
                 
                 # If still not found, try partial matching (substring search)
                 if not local_path:
-                    normalized_request = img_name.lower().replace("_", "").replace(" ", "").replace("-", "")
                     for norm_name, path in image_files_by_normalized.items():
                         # Check if either name contains the other
                         if normalized_request in norm_name or norm_name in normalized_request:
@@ -674,9 +932,8 @@ def stage6_create_ffmpeg_slides(
                 
                 # If STILL not found, try word-based matching (split by common delimiters)
                 if not local_path:
-                    import re
                     # Extract words from the request
-                    request_words = set(re.split(r'[_\s-]+', img_name.lower()))
+                    request_words = set(NAME_WORD_SPLIT_RE.split(img_name.lower()))
                     request_words.discard('')
                     
                     best_match = None
@@ -684,7 +941,7 @@ def stage6_create_ffmpeg_slides(
                     
                     for img_info in images_info:
                         available_name = img_info.get("name", "").lower().replace("_nobg", "")
-                        available_words = set(re.split(r'[_\s-]+', available_name))
+                        available_words = set(NAME_WORD_SPLIT_RE.split(available_name))
                         available_words.discard('')
                         
                         # Calculate match score (how many words overlap)
@@ -721,63 +978,22 @@ def stage6_create_ffmpeg_slides(
                 })
                 logging.info("✓ Found image '%s' at position %s (%dx%d at %d,%d)", img_name, position, img_width, img_height, x, y)
             
-            # Build ffmpeg command
-            if len(found_images) == 0:
-                # No images - just create a solid color background
-                cmd = ["ffmpeg", "-y", "-f", "lavfi", "-i", f"color=c=0x2d3436:s={slide_width}x{slide_height}:d=1",
-                       "-frames:v", "1", output_path]
-            else:
-                # Build filter_complex with found images
-                # Start with background
-                filter_parts.append(f"color=c=0x2d3436:s={slide_width}x{slide_height}:d=1[bg]")
-                
-                # Add each image as input and create scale filters
-                for idx, img_info in enumerate(found_images):
-                    inputs.extend(["-i", img_info['path']])
-                    input_idx = idx + 1  # Input 0 is the color background, images start at 1
-                    filter_parts.append(f"[{input_idx}:v]scale={img_info['width']}:{img_info['height']}[img{idx}]")
-                
-                # Build overlay chain
-                overlay_chain = "[bg]"
-                for idx, img_info in enumerate(found_images):
-                    if idx < len(found_images) - 1:
-                        # Not the last image - output to tmp
-                        overlay_chain += f"[img{idx}]overlay={img_info['x']}:{img_info['y']}[tmp{idx}]"
-                        overlay_chain += f"; [tmp{idx}]"
-                    else:
-                        # Last image - no need for tmp output
-                        overlay_chain += f"[img{idx}]overlay={img_info['x']}:{img_info['y']}"
-                
-                filter_complex = "; ".join(filter_parts) + "; " + overlay_chain
-                
-                cmd = ["ffmpeg", "-y", "-f", "lavfi", "-i", f"color=c=0x2d3436:s={slide_width}x{slide_height}:d=1"]
-                cmd.extend(inputs)
-                cmd.extend(["-filter_complex", filter_complex, "-frames:v", "1", output_path])
-            
-            # Run ffmpeg
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logging.error("ffmpeg failed: %s", result.stderr)
-                raise RuntimeError(f"ffmpeg command failed: {result.stderr}")
+            # Composite in memory: cached background plus each image scaled into its box.
+            # Pasting with the image as its own mask keeps the rembg transparency, as the
+            # ffmpeg overlay filter did, without a subprocess and a PNG round trip per slide
+            img = _slide_background(slide_width, slide_height).copy()
+            for img_info in found_images:
+                st = os.stat(img_info['path'])
+                layer = _slide_layer(img_info['path'], img_info['width'], img_info['height'],
+                                     st.st_mtime_ns, st.st_size)
+                img.paste(layer, (img_info['x'], img_info['y']), layer)
             
             # Now add text overlays using PIL (more reliable than ffmpeg drawtext)
             if slide_data.get("slide_title") or slide_data.get("caption"):
-                from PIL import Image, ImageDraw, ImageFont
-                
-                img = Image.open(output_path)
                 draw = ImageDraw.Draw(img)
                 
                 # Try to load a nice font, fallback to default
-                try:
-                    title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 64)
-                    caption_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 42)
-                except:
-                    try:
-                        title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 64)
-                        caption_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 42)
-                    except:
-                        title_font = ImageFont.load_default()
-                        caption_font = ImageFont.load_default()
+                title_font, caption_font = _slide_fonts()
                 
                 # Add title at top
                 #print(slide_data)
@@ -798,69 +1014,52 @@ def stage6_create_ffmpeg_slides(
                 caption = slide_data['slides'][0].get("caption", "")
                 #print(caption)
                 if caption:
-                    # Calculate caption area
-                    max_width = slide_width - 100
-                    words = caption.split()
-                    lines = []
-                    current_line = []
-                    
-                    for word in words:
-                        current_line.append(word)
-                        test_line = " ".join(current_line)
-                        bbox = draw.textbbox((0, 0), test_line, font=caption_font)
-                        if bbox[2] - bbox[0] > max_width:
-                            if len(current_line) > 1:
-                                current_line.pop()
-                                lines.append(" ".join(current_line))
-                                current_line = [word]
-                            else:
-                                lines.append(test_line)
-                                current_line = []
-                    
-                    if current_line:
-                        lines.append(" ".join(current_line))
+                    # Wrap the caption to the slide width (minus side margins)
+                    lines = _wrap_by_width(draw, caption, caption_font, slide_width - 100)
                     
                     # Draw semi-transparent background for caption
                     line_height = 50
                     caption_height = len(lines) * line_height + 40
                     caption_y = slide_height - caption_height - 30
                     
-                    # Create semi-transparent overlay
-                    overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-                    overlay_draw = ImageDraw.Draw(overlay)
-                    overlay_draw.rectangle(
-                        [(50, caption_y), (slide_width - 50, slide_height - 30)],
-                        fill=(0, 0, 0, 180)
-                    )
-                    img = img.convert('RGBA')
-                    img = Image.alpha_composite(img, overlay).convert('RGB')
-                    draw = ImageDraw.Draw(img)
+                    # Blend a prerendered semi-transparent band over just the caption area
+                    band = _caption_band(slide_width - 100 + 1, slide_height - 30 - caption_y + 1)
+                    img.paste(band, (50, caption_y), band)
                     
-                    # Draw caption text
-                    for i, line in enumerate(lines):
-                        bbox = draw.textbbox((0, 0), line, font=caption_font)
-                        text_width = bbox[2] - bbox[0]
-                        text_x = (slide_width - text_width) // 2
-                        text_y = caption_y + 20 + i * line_height
-                        draw.text((text_x, text_y), line, fill=(255, 255, 255), font=caption_font)
-                
-                # Save updated image
-                img.save(output_path)
+                    # Draw caption text in one call: centred on the slide, one line every
+                    # line_height px (Pillow advances by the font's line height plus spacing)
+                    # (no anchor: Pillow only supports anchors on TrueType fonts, not the bitmap fallback)
+                    block_width = max((draw.textlength(line, font=caption_font) for line in lines), default=0)
+                    draw.multiline_text(
+                        ((slide_width - block_width) // 2, caption_y + 20), "\n".join(lines),
+                        fill=(255, 255, 255), font=caption_font, align="center",
+                        spacing=line_height - caption_font.getbbox("A")[3],
+                    )
             
-            exported_slides.append({
+            # Slides are intermediates that ffmpeg re-encodes straight away, so spend as
+            # little time in zlib as possible; the mostly-flat frames still compress well
+            img.save(output_path, compress_level=1)
+            
+            logging.info("✓ Created slide: %s", output_path)
+            return {
                 "index": idx,
                 "title": slide_data.get("slide_title"),
                 "caption": slide_data.get("caption"),
                 "path": output_path,
                 "duration": slide_data.get("slide_duration", 6)
-            })
-            
-            logging.info("✓ Created slide: %s", output_path)
+            }
             
         except Exception as e:
             logging.error("Failed to create slide %d: %s", idx, e)
             import traceback
             traceback.print_exc()
+            return None
+    
+    # Slides only read the shared lookups and cached assets, so render them side by side;
+    # PIL's resize, paste and PNG encoding release the GIL
+    with ThreadPoolExecutor(max_workers=max(1, SLIDE_RENDER_CONCURRENCY)) as pool:
+        rendered = pool.map(lambda item: _render_slide(*item), enumerate(slides_data))
+        exported_slides = [slide for slide in rendered if slide is not None]
     
     # Save slide info
     info_path = os.path.join(OUT_DIR, "ffmpeg_slides_info.json")
@@ -897,15 +1096,164 @@ def _calculate_ffmpeg_position(position_str: str, canvas_width: int, canvas_heig
     return (x, y)
 
 
+def _tts_cache_path(text: str, out_path: str, voice: str = "alloy", cheerful: bool = True) -> str:
+    """Cache location for a narration; the key covers everything that changes how it sounds"""
+    if ELEVENLABS_API_KEY:
+        settings = json.dumps(ELEVENLABS_VOICE_SETTINGS, sort_keys=True)
+        engine = f"elevenlabs|{voice}|{settings}|cheerful={cheerful}"
+    else:
+        # pyttsx3 uses the system default voice and ignores voice/cheerful
+        engine = f"pyttsx3|rate={LOCAL_TTS_RATE}"
+    key = hashlib.sha256(f"{engine}|{text}".encode("utf-8")).hexdigest()
+    return os.path.join(TTS_CACHE_DIR, key + os.path.splitext(out_path)[1])
+
+
+def _prune_tts_cache() -> None:
+    """Evict least recently used clips (by mtime, refreshed on hits) past TTS_CACHE_MAX_BYTES"""
+    try:
+        with os.scandir(TTS_CACHE_DIR) as entries:
+            clips = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in entries
+                     if e.is_file() and not e.name.endswith(".part")]
+    except OSError:
+        return
+    total = sum(size for _, size, _ in clips)
+    for _, size, path in sorted(clips):
+        if total <= TTS_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def tts_synthesize_batch(texts: List[str], out_paths: List[str], voice: str = "alloy",
+                         cheerful: bool = True) -> List[Optional[Exception]]:
+    """Synthesize several narrations; returns the error for each item (None on success).
+
+    Narrations already synthesized on an earlier run are copied from TTS_CACHE_DIR.
+    ElevenLabs requests run concurrently on the TTS pool. Local pyttsx3 queues every
+    utterance on the shared engine and drains them with a single runAndWait().
+    """
+    errors: List[Optional[Exception]] = [None] * len(texts)
+    missing = []
+    for n, (text, out_path) in enumerate(zip(texts, out_paths)):
+        if not _copy_from_cache(_tts_cache_path(text, out_path, voice, cheerful), out_path):
+            missing.append(n)
+
+    if missing:
+        logging.info("Synthesizing %d narrations (%d from cache)", len(missing), len(texts) - len(missing))
+        results = _synthesize_uncached([texts[n] for n in missing], [out_paths[n] for n in missing],
+                                       voice, cheerful)
+        for n, error in zip(missing, results):
+            errors[n] = error
+            if error is None:
+                _publish_to_cache(out_paths[n], _tts_cache_path(texts[n], out_paths[n], voice, cheerful))
+        _prune_tts_cache()
+
+    return errors
+
+
+def _synthesize_uncached(texts: List[str], out_paths: List[str], voice: str = "alloy",
+                         cheerful: bool = True) -> List[Optional[Exception]]:
+    """tts_synthesize_batch without the cache"""
+    if not texts:
+        return []
+
+    if not ELEVENLABS_API_KEY and TTS_LOCAL_AVAILABLE:
+        try:
+            with _LOCAL_TTS_LOCK:
+                engine = _get_local_tts_engine()
+                for text, out_path in zip(texts, out_paths):
+                    engine.save_to_file(text, out_path)
+                engine.runAndWait()
+        except Exception as e:
+            logging.error("Local TTS (pyttsx3) failed: %s", e)
+            return [RuntimeError(f"Local TTS failed: {str(e)}") for _ in texts]
+        # An empty file means the engine gave up on that utterance; it must not be cached
+        return [None if os.path.exists(path) and os.path.getsize(path) > 0
+                else RuntimeError(f"Local TTS produced no audio for {path}")
+                for path in out_paths]
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, TTS_CONCURRENCY)) as pool:
+        futures = [pool.submit(tts_synthesize, text, path, voice, cheerful) for text, path in zip(texts, out_paths)]
+        for future in futures:
+            try:
+                future.result()
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+    return errors
+
+
+def synthesize_script_narrations(step1_path: str, audio_dir: str) -> Dict[str, str]:
+    """Synthesize the narration of every Stage 1 segment; returns {narration text: audio path}.
+
+    Narration only depends on the script, so callers can run this alongside stages 2-6
+    and pass the result to stage7_compose_video. Failures are logged and left out;
+    stage 7 retries those slides itself and reports the error properly.
+    """
+    with open(step1_path, "r", encoding="utf-8") as f:
+        segments = json.load(f).get("segments", [])
+
+    narrations = []
+    for segment in segments:
+        narration = segment.get("narration", "")
+        if isinstance(narration, list):
+            narration = " ".join(narration)
+        if narration and narration not in narrations:
+            narrations.append(narration)
+
+    os.makedirs(audio_dir, exist_ok=True)
+    paths = [os.path.join(audio_dir, f"narration_{n}.wav") for n in range(len(narrations))]
+    audio = {}
+    for text, path, error in zip(narrations, paths, tts_synthesize_batch(narrations, paths)):
+        if error is None:
+            audio[text] = path
+        else:
+            logging.warning("Early narration synthesis failed, stage 7 will retry: %s", error)
+
+    logging.info("Pre-generated narration audio for %d/%d segments", len(audio), len(narrations))
+    return audio
+
+
+@lru_cache(maxsize=1)
+def _h264_encoder() -> str:
+    """Pick the H.264 encoder for slide videos once per process.
+
+    ffmpeg builds list hardware encoders whether or not the machine has the hardware
+    (e.g. h264_nvenc without an NVIDIA GPU), so one is only chosen if a tiny test
+    encode with it actually succeeds.
+    """
+    if VIDEO_HW_ENCODE:
+        for encoder in HW_H264_ENCODERS:
+            probe_cmd = [
+                "ffmpeg", "-hide_banner", "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+                "-c:v", encoder, "-f", "null", "-",
+            ]
+            try:
+                probe = subprocess.run(probe_cmd, capture_output=True, timeout=30)
+            except (OSError, subprocess.TimeoutExpired):
+                continue
+            if probe.returncode == 0:
+                logging.info("Using hardware encoder %s for slide videos", encoder)
+                return encoder
+    return "libx264"
+
+
 def stage7_compose_video(slides_path: str = os.path.join(OUT_DIR, "step4_slides.json"),
                           step1_path: str = os.path.join(OUT_DIR, "step1_script.json"),
                           slides_dir: str = PPTX_SLIDES_DIR, 
                           output_video: str = os.path.join(OUT_DIR, "final_video.mp4"), 
                           music_path: Optional[str] = None, 
-                          use_canva_slides: bool = True):
+                          use_canva_slides: bool = True,
+                          narration_audio: Optional[Dict[str, str]] = None):
     """Assemble slides into an MP4 using ffmpeg. Creates narration per slide and composes.
     
     Now uses narration directly from Stage 1 script for more accurate voice-over.
+    narration_audio maps narration text to audio already synthesized (see
+    synthesize_script_narrations); only slides without a match hit TTS here.
     
     If use_canva_slides=True, uses professionally designed slides from python-pptx (stage 6).
     Otherwise, falls back to simple image+text composition with ffmpeg.
@@ -931,150 +1279,206 @@ def stage7_compose_video(slides_path: str = os.path.join(OUT_DIR, "step4_slides.
 
     temp_dir = tempfile.mkdtemp(prefix="video_build_")
     logging.info("Using temp dir %s", temp_dir)
-    segment_files = []
-
-    # Generate per-slide media
-    for i, slide in enumerate(slides):
-        duration = slide.get("slide_duration", 6)
-        
-        # Use narration from Stage 1 script if available, otherwise fallback to slide data
-        narration = ""
-        if i < len(script_segments):
-            narration = script_segments[i].get("narration", "")
-            logging.info("Using Stage 1 narration for slide %d: '%s...'", i, narration[:50])
+    # Whatever happens from here on, the per-slide audio/video in temp_dir is discarded
+    try:
+        segment_files = []
+
+        narrations = []
+        for i, slide in enumerate(slides):
+            # Use narration from Stage 1 script if available, otherwise fallback to slide data
+            narration = ""
+            if i < len(script_segments):
+                narration = script_segments[i].get("narration", "")
+                logging.info("Using Stage 1 narration for slide %d: '%s...'", i, narration[:50])
         
-        # Fallback to slide data if no script narration available
-        if not narration:
-            narration = slide.get("narration") or slide.get("caption") or slide.get("slide_title", "")
-            logging.warning("No Stage 1 narration for slide %d, using fallback", i)
+            # Fallback to slide data if no script narration available
+            if not narration:
+                narration = slide.get("narration") or slide.get("caption") or slide.get("slide_title", "")
+                logging.warning("No Stage 1 narration for slide %d, using fallback", i)
         
-        if isinstance(narration, list):
-            narration = " ".join(narration)
-
-        audio_path = os.path.join(temp_dir, f"slide_{i}.wav")
-        try:
-            tts_synthesize(narration, audio_path)
+            if isinstance(narration, list):
+                narration = " ".join(narration)
+            narrations.append(narration)
+
+        # Synthesize every slide's narration up front; the TTS calls are network-bound
+        # and independent, so they overlap instead of running one slide at a time
+        audio_paths = []
+        tts_jobs = []
+        for i, text in enumerate(narrations):
+            ready = (narration_audio or {}).get(text)
+            if ready and os.path.exists(ready):
+                audio_paths.append(ready)
+                logging.info("✓ Reusing pre-generated audio for slide %d", i)
+                continue
+            path = os.path.join(temp_dir, f"slide_{i}.wav")
+            audio_paths.append(path)
+            tts_jobs.append((i, text, path))
+
+        failure = None
+        errors = tts_synthesize_batch([text for _, text, _ in tts_jobs], [path for _, _, path in tts_jobs])
+        for (i, _, _), error in zip(tts_jobs, errors):
+            if error is not None:
+                failure = (i, error)
+                break
             logging.info("✓ Generated audio for slide %d", i)
-            
-        except RuntimeError as e:
-            # TTS failed - this is a critical error, clean up and propagate
-            logging.error("Audio generation failed for slide %d: %s", i, e)
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            raise RuntimeError(f"Failed to generate audio for slide {i}: {str(e)}. Video creation cannot continue without audio narration.") from e
-        except Exception as e:
+
+        if failure is not None:
+            i, e = failure
+            if isinstance(e, RuntimeError):
+                # TTS failed - this is a critical error, clean up and propagate
+                logging.error("Audio generation failed for slide %d: %s", i, e)
+                raise RuntimeError(f"Failed to generate audio for slide {i}: {str(e)}. Video creation cannot continue without audio narration.") from e
             # Unexpected error
             logging.error("Unexpected error during TTS for slide %d: %s", i, e)
-            shutil.rmtree(temp_dir, ignore_errors=True)
             raise RuntimeError(f"Unexpected error generating audio for slide {i}: {str(e)}") from e
 
-        try:
-            audio_length_cmd = [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1", audio_path
-            ]
-            audio_duration = float(subprocess.check_output(audio_length_cmd).decode().strip())
-            duration = max(duration, audio_duration)
-        except Exception as e:
-            logging.warning("Could not determine audio duration for slide %s: %s", i, e)
+        # Generate per-slide media
+        encoder = _h264_encoder()
+        if encoder == "libx264":
+            # Slides are static images (apart from the fades): stillimage tuning plus a fast
+            # preset cuts encode time sharply with no visible quality loss
+            video_codec_args = ["-c:v", "libx264", "-preset", "veryfast", "-tune", "stillimage",
+                                "-threads", str(ENCODE_THREADS)]
+            encode_workers = ENCODE_CONCURRENCY
+        else:
+            video_codec_args = ["-c:v", encoder, "-b:v", HW_ENCODE_BITRATE]
+            encode_workers = min(ENCODE_CONCURRENCY, HW_ENCODE_SESSIONS)
+
+        # List the image dirs once up front rather than stat-ing and re-listing them per slide
+        pngs_by_dir = {}
+        for search_dir in (slides_dir, IMAGES_DIR, os.path.join(IMAGES_DIR, "no_bg")):
+            try:
+                with os.scandir(search_dir) as entries:
+                    pngs_by_dir[search_dir] = [e.name for e in entries if e.name.lower().endswith(".png")]
+            except OSError:
+                pngs_by_dir[search_dir] = []
+        png_sets = {d: set(names) for d, names in pngs_by_dir.items()}
+
+        encode_jobs = []
+        for i, slide in enumerate(slides):
+            duration = slide.get("slide_duration", 6)
+            audio_path = audio_paths[i]
+
+            try:
+                audio_length_cmd = [
+                    "ffprobe", "-v", "error",
+                    "-show_entries", "format=duration",
+                    "-of", "default=noprint_wrappers=1:nokey=1", audio_path
+                ]
+                audio_duration = float(subprocess.check_output(audio_length_cmd).decode().strip())
+                duration = max(duration, audio_duration)
+            except Exception as e:
+                logging.warning("Could not determine audio duration for slide %s: %s", i, e)
 
 
-        # Choose slide image
-        img_entry = None
+            # Choose slide image
+            img_entry = None
         
-        if use_canva_slides:
-            # Use Canva-generated slide (numbered slide_XXX.png)
-            canva_slide = os.path.join(slides_dir, f"slide_{i:03d}.png")
-            if os.path.exists(canva_slide):
-                img_entry = canva_slide
-                logging.info("Using Canva slide: %s", canva_slide)
+            if use_canva_slides:
+                # Use Canva-generated slide (numbered slide_XXX.png)
+                canva_slide = os.path.join(slides_dir, f"slide_{i:03d}.png")
+                if f"slide_{i:03d}.png" in png_sets[slides_dir]:
+                    img_entry = canva_slide
+                    logging.info("Using Canva slide: %s", canva_slide)
         
-        if not img_entry:
-            # Fallback: use images from stage 3/4
-            imgs = slide.get("images") or []
-            if imgs:
-                # support simple case where images is list of names
-                img_name = imgs[0].get("name") if isinstance(imgs[0], dict) else imgs[0]
-                # Check in Canva slides dir first, then fallback to IMAGES_DIR
-                for search_dir in [slides_dir, IMAGES_DIR, os.path.join(IMAGES_DIR, "no_bg")]:
-                    candidate = os.path.join(search_dir, f"{img_name}.png")
-                    if os.path.exists(candidate):
-                        img_entry = candidate
-                        break
+            if not img_entry:
+                # Fallback: use images from stage 3/4
+                imgs = slide.get("images") or []
+                if imgs:
+                    # support simple case where images is list of names
+                    img_name = imgs[0].get("name") if isinstance(imgs[0], dict) else imgs[0]
+                    # Check in Canva slides dir first, then fallback to IMAGES_DIR
+                    for search_dir in [slides_dir, IMAGES_DIR, os.path.join(IMAGES_DIR, "no_bg")]:
+                        if f"{img_name}.png" in png_sets[search_dir]:
+                            img_entry = os.path.join(search_dir, f"{img_name}.png")
+                            break
 
-        if not img_entry:
-            # pick any image in slides_dir or images_dir
-            for search_dir in [slides_dir, IMAGES_DIR]:
-                if os.path.exists(search_dir):
-                    candidates = [os.path.join(search_dir, f) for f in os.listdir(search_dir) if f.lower().endswith(".png")]
-                    if candidates:
-                        img_entry = candidates[0]
+            if not img_entry:
+                # pick any image in slides_dir or images_dir
+                for search_dir in [slides_dir, IMAGES_DIR]:
+                    if pngs_by_dir[search_dir]:
+                        img_entry = os.path.join(search_dir, pngs_by_dir[search_dir][0])
                         break
 
-        if not img_entry:
-            logging.error("No images found for slide %s — skipping", i)
-            continue
+            if not img_entry:
+                logging.error("No images found for slide %s — skipping", i)
+                continue
 
-        # Make a video from image using simple zoompan (Ken Burns) via ffmpeg
-        slide_video = os.path.join(temp_dir, f"slide_{i}.mp4")
-        # Create a video with duration and a subtle zoom
-        zoom_filter = "zoompan=z='if(lte(in,0),1,zoom+0.0008)':d=1"
-        cmd = [
-            "ffmpeg", "-y", "-loop", "1", "-i", img_entry, "-i", audio_path,
-            "-vf", f"fade=t=in:st=0:d=0.5,fade=t=out:st={duration-0.5}:d=0.5",
-            "-c:v", "libx264", "-t", str(duration), "-pix_fmt", "yuv420p",
-            "-c:a", "aac", "-b:a", "192k", "-ar", "44100", "-ac", "2",
-            slide_video
-        ]
-        logging.info("Rendering slide video %s with audio", slide_video)
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        if result.returncode != 0:
-            logging.error("ffmpeg failed for slide %d: %s", i, result.stderr)
-        else:
+            # Make a video from image using simple zoompan (Ken Burns) via ffmpeg
+            slide_video = os.path.join(temp_dir, f"slide_{i}.mp4")
+            # Create a video with duration and a subtle zoom
+            zoom_filter = "zoompan=z='if(lte(in,0),1,zoom+0.0008)':d=1"
+            cmd = [
+                # The slide is a still, so read it at 1 fps and let the fps filter duplicate
+                # frames, rather than having the looping demuxer decode the PNG for every frame
+                "ffmpeg", "-y", "-loop", "1", "-framerate", "1", "-i", img_entry, "-i", audio_path,
+                "-vf", f"fps={VIDEO_FPS},fade=t=in:st=0:d=0.5,fade=t=out:st={duration-0.5}:d=0.5",
+                *video_codec_args,
+                "-t", str(duration), "-pix_fmt", "yuv420p",
+                "-c:a", "aac", "-b:a", "192k", "-ar", "44100", "-ac", "2",
+                slide_video
+            ]
+            encode_jobs.append((i, cmd))
+
+            # Attach subtitle/caption as burned-in text can be done optionally; skip for simplicity.
+            segment_files.append(slide_video)
+
+        # Slides are independent, so encode them side by side; ffmpeg runs as separate
+        # processes and segment_files keeps the original slide order for concatenation
+        def _encode_slide(job):
+            i, cmd = job
+            logging.info("Rendering slide video %s with audio", cmd[-1])
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                logging.error("ffmpeg failed for slide %d: %s", i, result.stderr)
+                raise RuntimeError(f"Failed to encode slide {i}: {result.stderr}")
             logging.info("✓ Slide %d video created with audio track", i)
 
-        # Attach subtitle/caption as burned-in text can be done optionally; skip for simplicity.
-        segment_files.append(slide_video)
-
-    # Concatenate segment videos
-    concat_list = os.path.join(temp_dir, "concat.txt")
-    with open(concat_list, "w", encoding="utf-8") as f:
-        for sf in segment_files:
-            f.write(f"file '{sf}'\n")
-
-    final_tmp = os.path.join(temp_dir, "final_tmp.mp4")
-    logging.info("Concatenating %d slide videos with audio...", len(segment_files))
-    concat_cmd = [
-        "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list,
-        "-c:v", "copy", "-c:a", "aac", "-b:a", "192k", "-ar", "44100",
-        final_tmp
-    ]
-    result = subprocess.run(concat_cmd, check=True, capture_output=True, text=True)
-    if result.returncode != 0:
-        logging.error("Video concatenation failed: %s", result.stderr)
-        raise RuntimeError(f"Failed to concatenate videos: {result.stderr}")
-    
-    logging.info("✓ Video concatenation complete with audio")
-
-    # Optionally add background music (looped softly)
-    if music_path and os.path.exists(music_path):
-        logging.info("Adding background music: %s", music_path)
-        # Mix music at low volume
-        music_cmd = [
-            "ffmpeg", "-y", "-i", final_tmp, "-stream_loop", "-1", "-i", music_path,
-            "-filter_complex", "[1:a]volume=0.15[a1];[0:a][a1]amix=inputs=2:duration=shortest[aout]",
-            "-map", "0:v", "-map", "[aout]",
-            "-c:v", "copy", "-c:a", "aac", "-b:a", "192k",
-            output_video
+        with ThreadPoolExecutor(max_workers=max(1, encode_workers)) as pool:
+            list(pool.map(_encode_slide, encode_jobs))
+
+        # Concatenate segment videos
+        concat_list = os.path.join(temp_dir, "concat.txt")
+        with open(concat_list, "w", encoding="utf-8") as f:
+            for sf in segment_files:
+                f.write(f"file '{sf}'\n")
+
+        final_tmp = os.path.join(temp_dir, "final_tmp.mp4")
+        logging.info("Concatenating %d slide videos with audio...", len(segment_files))
+        # Every slide video is encoded with identical video/audio settings above, so the
+        # concat demuxer can stream-copy both tracks instead of re-encoding the audio
+        concat_cmd = [
+            "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list,
+            "-c", "copy",
+            final_tmp
         ]
-        subprocess.run(music_cmd, check=True)
-        logging.info("✓ Background music added")
-    else:
-        shutil.move(final_tmp, output_video)
-        logging.info("✓ Final video saved (no background music)")
+        result = subprocess.run(concat_cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            logging.error("Video concatenation failed: %s", result.stderr)
+            raise RuntimeError(f"Failed to concatenate videos: {result.stderr}")
+        
+        logging.info("✓ Video concatenation complete with audio")
+
+        # Optionally add background music (looped softly)
+        if music_path and os.path.exists(music_path):
+            logging.info("Adding background music: %s", music_path)
+            # Mix music at low volume
+            music_cmd = [
+                "ffmpeg", "-y", "-i", final_tmp, "-stream_loop", "-1", "-i", music_path,
+                "-filter_complex", "[1:a]volume=0.15[a1];[0:a][a1]amix=inputs=2:duration=shortest[aout]",
+                "-map", "0:v", "-map", "[aout]",
+                "-c:v", "copy", "-c:a", "aac", "-b:a", "192k",
+                output_video
+            ]
+            subprocess.run(music_cmd, check=True)
+            logging.info("✓ Background music added")
+        else:
+            shutil.move(final_tmp, output_video)
+            logging.info("✓ Final video saved (no background music)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
     logging.info("Final video saved to %s", output_video)
-    shutil.rmtree(temp_dir)
     return output_video
 
 
@@ -15,10 +15,12 @@ All intermediate outputs are stored in organized directories.
 
 import os
 import json
+import asyncio
 import logging
 import shutil
 from typing import Dict, Any, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Import all the workflow stages from agent.py
 from .agent import (
@@ -29,6 +31,7 @@ from .agent import (
     stage5_generate_slides,
     stage6_create_ffmpeg_slides,
     stage7_compose_video,
+    synthesize_script_narrations,
     save_json,
     load_text_file
 )
@@ -73,6 +76,7 @@ def run_agent(input_data: Dict[str, Any]) -> Dict[str, Any]:
         "images": os.path.join(trial_output_dir, "images"),
         "images_nobg": os.path.join(trial_output_dir, "images", "no_bg"),
         "slides": os.path.join(trial_output_dir, "slides"),
+        "audio": os.path.join(trial_output_dir, "audio"),
         "prompts": os.path.join(trial_output_dir, "prompts")
     }
     
@@ -82,6 +86,7 @@ def run_agent(input_data: Dict[str, Any]) -> Dict[str, Any]:
     logging.info(f"Starting video generation pipeline for trial {trial_id}")
     logging.info(f"Output directory: {trial_output_dir}")
     
+    narration_pool = None
     try:
         # Prepare trial summary text (combine structured data and simple text)
         trial_summary = f"""
@@ -107,6 +112,11 @@ Structured Information:
         )
         logging.info(f"✓ Script generated: {len(script_data.get('segments', []))} segments")
         
+        # Narration depends only on the script, so synthesize it in the background
+        # while stages 2-6 generate images and slides; stage 7 picks up the result
+        narration_pool = ThreadPoolExecutor(max_workers=1)
+        narration_future = narration_pool.submit(synthesize_script_narrations, script_path, dirs["audio"])
+        
         # Stage 2: Generate visual asset requirements
         logging.info("Stage 2: Extracting visual asset requirements...")
         assets_path = os.path.join(dirs["outputs"], "step2_assets.json")
@@ -184,6 +194,13 @@ Structured Information:
         logging.info(f"✓ Slides created: {len(slide_info)} slide images")
         
         # Stage 7: Compose final video
+        # The early narration is only a pre-warm: if it failed, stage 7 synthesizes it itself
+        try:
+            narration_audio = narration_future.result()
+        except Exception as e:
+            logging.warning("Background narration failed, stage 7 will synthesize it: %s", e)
+            narration_audio = None
+        
         logging.info("Stage 7: Composing final video...")
         final_video_path = os.path.join(trial_output_dir, "final_video.mp4")
         video_path = stage7_compose_video(
@@ -192,7 +209,8 @@ Structured Information:
             slides_dir=dirs["slides"],
             output_video=final_video_path,
             music_path=music_path,
-            use_canva_slides=True
+            use_canva_slides=True,
+            narration_audio=narration_audio
         )
         logging.info(f"✓ Video composed: {video_path}")
         
@@ -248,4 +266,21 @@ Structured Information:
             "status": "error",
             "error": str(e),
             "error_details": error_path
-        }
\ No newline at end of file
+        }
+    
+    finally:
+        # If an earlier stage failed, don't leave TTS writing into this run's audio dir
+        # after we've returned; queued work is cancelled and a running batch is joined
+        if narration_pool is not None:
+            narration_pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def run_agent_async(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async wrapper around run_agent.
+
+    The pipeline is blocking (Gemini, Pollinations, ffmpeg), so it runs in a
+    worker thread; this keeps the event loop free and lets callers gather it
+    alongside the infographic agent.
+    """
+    return await asyncio.to_thread(run_agent, input_data)
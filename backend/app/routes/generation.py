@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Body
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Body, Request
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import Dict, Any
 from pydantic import BaseModel
 
@@ -7,12 +8,11 @@ from app.database import get_db
 from app.models.models import User, Trial, GeneratedContent
 from app.models.schemas import GeneratedContentResponse
 from app.routes.auth import get_current_user
-from app.utils.file_utils import extract_text_from_pdf, get_file_extension
+from app.utils.file_utils import extract_text_from_pdf, read_text_file, get_file_extension
 
 # Import AI agents
-from app.agents import distill_agent, infographic_agent
-from app.agents.distill_agent import distill_agent
-from app.agents.video_agent import video_agent
+from app.agents import infographic_agent
+from app.agents.distill_agent import DistillAgent
 
 router = APIRouter(prefix="/api/generate", tags=["generation"])
 
@@ -24,6 +24,7 @@ class ContentUpdate(BaseModel):
 @router.post("/summary/{trial_id}", response_model=GeneratedContentResponse)
 async def generate_summary(
     trial_id: int,
+    request: Request,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -56,10 +57,9 @@ async def generate_summary(
         file_ext = get_file_extension(trial.protocol_file_path)
         
         if file_ext == 'pdf':
-            protocol_text = extract_text_from_pdf(trial.protocol_file_path)
+            protocol_text = await run_in_threadpool(extract_text_from_pdf, trial.protocol_file_path)
         elif file_ext == 'txt':
-            with open(trial.protocol_file_path, 'r') as f:
-                protocol_text = f.read()
+            protocol_text = await run_in_threadpool(read_text_file, trial.protocol_file_path)
         else:
             raise HTTPException(status_code=400, detail="Unsupported file type")
         
@@ -74,7 +74,9 @@ async def generate_summary(
             "trial_id": trial_id
         }
 
-        extracted_data = distill_agent.DistillAgent().run(agent_input)
+        # Reuse the agent built at startup; fall back to a fresh one if that failed
+        agent = getattr(request.app.state, "distill", None) or DistillAgent()
+        extracted_data = await agent.run_async(agent_input)
 
         existing_content = db.query(GeneratedContent).filter(
             GeneratedContent.trial_id == trial_id,
@@ -152,7 +154,7 @@ async def generate_infographic(
             "style": "modern"
         }
         
-        result = infographic_agent.run_agent(agent_input)
+        result = await infographic_agent.run_agent_async(agent_input)
         
         # Save to database
         existing_content = db.query(GeneratedContent).filter(
@@ -218,6 +220,9 @@ async def generate_video(
     try:
         import json
         import logging
+        # Imported here: the video pipeline pulls in rembg/onnxruntime/pyttsx3,
+        # which would otherwise load at API startup even if no video is requested
+        from app.agents.video_agent import video_agent
         
         # Parse the summary content - it's now just plain text, not JSON
         summary_text = summary_content.content_text
@@ -236,7 +241,7 @@ async def generate_video(
             "duration": 90  # 90 second video
         }
         
-        result = video_agent.run_agent(agent_input)
+        result = await video_agent.run_agent_async(agent_input)
         
         # Check if video generation was successful
         if result.get("status") != "success":
@@ -309,8 +314,11 @@ async def get_content_data(
         "is_approved": content.is_approved
     }
     
-    # Parse JSON content if available
-    if content.content_text:
+    # Parse JSON content if available. Summaries are stored as the distill
+    # agent's plain-text output, so don't attempt (and fail) a JSON parse on them
+    if content.content_text and content.content_type == "summary":
+        response["data"] = {"text": content.content_text}
+    elif content.content_text:
         try:
             response["data"] = json.loads(content.content_text)
         except:
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List
 import os
 
@@ -7,10 +8,14 @@ from app.database import get_db
 from app.models.models import User, Trial
 from app.models.schemas import TrialCreate, TrialResponse, TrialWithContent
 from app.routes.auth import get_current_user
-from app.utils.file_utils import save_upload_file, extract_text_from_pdf, get_file_extension
+from app.utils.file_utils import save_upload_file, extract_text_from_pdf, read_text_file, get_file_extension
 from app.config import get_settings
 
 settings = get_settings()
+
+# Number of leading pages read when a caller only wants a preview of the protocol
+PREVIEW_PAGES = 5
+
 router = APIRouter(prefix="/api/trials", tags=["trials"])
 
 
@@ -123,10 +128,14 @@ async def delete_trial(
 @router.get("/{trial_id}/protocol-text")
 async def get_protocol_text(
     trial_id: int,
+    preview: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Extract and return the raw text from the protocol file"""
+    """
+    Extract and return the raw text from the protocol file.
+    With ?preview=true only the first PREVIEW_PAGES pages of a PDF are read.
+    """
     trial = db.query(Trial).filter(
         Trial.id == trial_id,
         Trial.user_id == current_user.id
@@ -143,10 +152,10 @@ async def get_protocol_text(
         file_ext = get_file_extension(trial.protocol_file_path)
         
         if file_ext == 'pdf':
-            text = extract_text_from_pdf(trial.protocol_file_path)
+            maxpages = PREVIEW_PAGES if preview else 0
+            text = await run_in_threadpool(extract_text_from_pdf, trial.protocol_file_path, maxpages=maxpages)
         elif file_ext == 'txt':
-            with open(trial.protocol_file_path, 'r') as f:
-                text = f.read()
+            text = await run_in_threadpool(read_text_file, trial.protocol_file_path)
         else:
             raise HTTPException(status_code=400, detail="Unsupported file type")
         
@@ -1,40 +1,207 @@
+import io
 import os
 import shutil
+import hashlib
+import tempfile
 from fastapi import UploadFile
-from PyPDF2 import PdfReader
-from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from typing import Iterable, List, Optional
+
+from app.config import get_settings
+
+# PyMuPDF (C-based MuPDF) is much faster than PyPDF2; PyPDF2 stays as a fallback
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+try:
+    from PyPDF2 import PdfReader
+except ImportError:
+    PdfReader = None
+
+# Block size for userspace copies and hashing; copyfileobj's 16-64 KiB default means many tiny syscalls
+CHUNK_SIZE = 1024 * 1024
+
+# Part of every extracted-text cache filename; bump when extraction output changes
+TEXT_CACHE_VERSION = "v2"
+# Extracted-text cache budget; least recently used entries are evicted past it
+TEXT_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+
+def _source_fd(src) -> Optional[int]:
+    """
+    Return the OS file descriptor behind src, or None if it only lives in memory.
+
+    Starlette uploads are SpooledTemporaryFiles, whose fileno() would roll an
+    in-memory upload over to disk first. For those only the backing file is
+    asked: a BytesIO has no descriptor, and if the backing file can't be
+    found the caller falls back to a userspace copy.
+    """
+    if isinstance(src, tempfile.SpooledTemporaryFile):
+        src = getattr(src, "_file", None)
+        if src is None:
+            return None
+    try:
+        return src.fileno()
+    except (AttributeError, io.UnsupportedOperation, OSError):
+        return None
+
+
+def _save_file_sync(src, destination: str) -> None:
+    """Copy src to destination, using kernel zero-copy sendfile when src is a real file"""
+    in_fd = _source_fd(src) if hasattr(os, "sendfile") else None
+
+    with open(destination, "wb") as buffer:
+        if in_fd is not None:
+            src.seek(0, os.SEEK_END)
+            remaining = src.tell()
+            offset = 0
+            try:
+                while remaining > 0:
+                    sent = os.sendfile(buffer.fileno(), in_fd, offset, remaining)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    remaining -= sent
+                if remaining == 0:
+                    return
+            except OSError:
+                pass
+            # sendfile unsupported here (or stopped early) - redo the copy in userspace
+            buffer.seek(0)
+            buffer.truncate()
+
+        src.seek(0)
+        shutil.copyfileobj(src, buffer, CHUNK_SIZE)
 
 
 async def save_upload_file(upload_file: UploadFile, destination: str) -> str:
-    """Save an uploaded file to disk"""
+    """Save an uploaded file to disk without blocking the event loop"""
     os.makedirs(os.path.dirname(destination), exist_ok=True)
     
-    with open(destination, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
+    await run_in_threadpool(_save_file_sync, upload_file.file, destination)
     
     return destination
 
 
-def extract_text_from_pdf(file_path: str) -> str:
+def _select_pages(page_count: int, pages: Optional[Iterable[int]], maxpages: int) -> List[int]:
+    """Resolve the 0-based page indices to read, honouring pages and maxpages"""
+    indices = range(page_count) if pages is None else sorted(set(pages) & set(range(page_count)))
+    if maxpages:
+        indices = [i for i in indices if i < maxpages]
+    return list(indices)
+
+
+def _file_hash(file_path: str) -> str:
+    """BLAKE2b digest of the file contents, read in CHUNK_SIZE blocks"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_text_from_pdf(file_path: str, pages: Optional[Iterable[int]] = None, maxpages: int = 0) -> str:
     """
     Extract text from a PDF file.
-    This is a simple implementation - you may want to enhance this
-    with better PDF parsing libraries like pdfplumber or PyMuPDF.
+    Uses PyMuPDF when installed, otherwise falls back to PyPDF2.
+
+    pages limits extraction to the given 0-based page indices and maxpages
+    stops after the first N pages (0 means no limit), so previews don't
+    parse the whole protocol.
+
+    Results are cached under {upload_dir}/cache keyed by the file's content
+    hash, so re-reading (or re-uploading) the same PDF skips parsing.
     """
+    if pages is not None:
+        pages = sorted(set(pages))
+    page_key = "all" if pages is None else "p" + "_".join(str(i) for i in pages)
+    if maxpages:
+        page_key += f"-max{maxpages}"
+
+    cache_dir = os.path.join(get_settings().upload_dir, "cache")
+    cache_path = os.path.join(cache_dir, f"{_file_hash(file_path)}-{page_key}-{TEXT_CACHE_VERSION}.txt")
     try:
-        reader = PdfReader(file_path)
-        text = ""
-        
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        
+        with open(cache_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        os.utime(cache_path)  # mark as recently used for pruning
+        return text
+    except OSError:
+        pass
+
+    text = _extract_pdf_text(file_path, pages, maxpages)
+
+    # The cache is best-effort: a read-only or full upload_dir must not fail extraction.
+    # Write to a temp file and rename so readers never see a partial entry.
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
         return text
+
+    _prune_text_cache(cache_dir)
+    return text
+
+
+def _prune_text_cache(cache_dir: str) -> None:
+    """Evict least recently used entries (by mtime, refreshed on hits) past TEXT_CACHE_MAX_BYTES"""
+    try:
+        with os.scandir(cache_dir) as entries:
+            files = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                     for e in entries if e.is_file() and e.name.endswith(".txt")]
+    except OSError:
+        return
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= TEXT_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _extract_pdf_text(file_path: str, pages: Optional[Iterable[int]], maxpages: int) -> str:
+    """Parse the selected pages of a PDF into text"""
+    try:
+        if fitz is not None:
+            with fitz.open(file_path) as doc:
+                indices = _select_pages(doc.page_count, pages, maxpages)
+                # sort=True orders text blocks by their top y, then x; that fixes
+                # PDFs whose content stream is out of order, but side-by-side
+                # columns still come out interleaved rather than column by column
+                return "\n".join([doc[i].get_text("text", sort=True) for i in indices])
+
+        if PdfReader is None:
+            raise ImportError("Install PyMuPDF or PyPDF2 to read PDF files")
+
+        reader = PdfReader(file_path)
+        indices = _select_pages(len(reader.pages), pages, maxpages)
+        # Join once; extract_text() can return None for image-only pages
+        parts = [reader.pages[i].extract_text() or "" for i in indices]
+        return "\n".join(parts)
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
 
+def read_text_file(file_path: str) -> str:
+    """Read a plain-text protocol file"""
+    with open(file_path, 'r') as f:
+        return f.read()
+
+
 def get_file_extension(filename: str) -> Optional[str]:
-    """Get file extension from filename"""
-    if '.' in filename:
-        return filename.rsplit('.', 1)[1].lower()
-    return None
+    """Get file extension from filename (whatever follows the last dot, so ".pdf" gives "pdf")"""
+    _, dot, ext = filename.rpartition('.')
+    return ext.lower() if dot else None
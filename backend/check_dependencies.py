@@ -11,6 +11,7 @@ Run this after installing requirements.txt to ensure everything is set up correc
 import sys
 import subprocess
 import importlib.util
+import importlib.metadata
 
 def check_python_version():
     """Check if Python version is 3.8 or higher"""
@@ -26,16 +27,21 @@ def check_package(package_name, import_name=None):
     if import_name is None:
         import_name = package_name.replace('-', '_')
     
-    spec = importlib.util.find_spec(import_name)
+    try:
+        spec = importlib.util.find_spec(import_name)
+    except ModuleNotFoundError:
+        # Parent package of a dotted name (e.g. google.generativeai) is missing
+        spec = None
     if spec is None:
         print(f"✗ {package_name} - NOT INSTALLED")
         return False
     else:
+        # Read the version from package metadata rather than importing the
+        # module, which for rembg/onnxruntime means loading native libraries
         try:
-            module = importlib.import_module(import_name)
-            version = getattr(module, '__version__', 'unknown')
+            version = importlib.metadata.version(package_name)
             print(f"✓ {package_name} - version {version}")
-        except:
+        except importlib.metadata.PackageNotFoundError:
             print(f"✓ {package_name} - installed")
         return True
 
@@ -122,6 +128,7 @@ def main():
     # Check optional dependencies
     print("6. Checking optional packages...")
     optional_packages = [
+        ('PyMuPDF', 'fitz'),
         ('PyPDF2', 'PyPDF2'),
         ('python-jose', 'jose'),
         ('passlib', 'passlib'),
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -6,17 +7,33 @@ import os
 from app.database import engine, Base
 from app.routes import auth, trials, generation
 from app.config import get_settings
+from app.agents.distill_agent import DistillAgent
 
 settings = get_settings()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build long-lived agents once per worker so the first request doesn't pay for setup"""
+    # Create database tables (disable with AUTO_CREATE_TABLES=false once the schema is migrated)
+    if settings.auto_create_tables:
+        Base.metadata.create_all(bind=engine)
+
+    try:
+        app.state.distill = DistillAgent()
+    except ValueError as e:
+        # Keep the API up without a Gemini key; the summary route reports the error
+        print(f"Distill agent unavailable: {e}")
+        app.state.distill = None
+    yield
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Clinical Trial Education Platform",
     description="API for distilling clinical trial protocols into educational content",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS for frontend